@@ -36,7 +36,7 @@ from scrapers.common import (
 # DATA MODELS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProductRecord:
     """Standard product record schema (consistent across all sites)."""
     store: str
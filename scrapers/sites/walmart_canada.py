@@ -6,16 +6,32 @@ Extracts data from __NEXT_DATA__ JSON for reliability.
 Includes CAPTCHA solving integration for PerimeterX challenges.
 """
 
+import asyncio
 import json
 import logging
-import random
 import re
 import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Set
 from urllib.parse import urlparse
 
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeout
+import httpx
+import numpy as np
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeout
 
 from scrapers.base import BaseScraper, ProductRecord
 from scrapers.common import get_iso_timestamp
@@ -23,6 +39,34 @@ from scrapers.utils.sitemap_parser import SitemapParser, SitemapEntry, filter_wa
 from scrapers.utils.captcha_solver import CaptchaSolverManager
 
 
+# Precompiled patterns used on every product page
+_IP_ID_RE = re.compile(r'/ip/[^/]+/(\d+)')
+_PRICE_NUM_RE = re.compile(r'[\d,.]+')
+_NEXT_DATA_RE = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+# Exact availability values seen in __NEXT_DATA__, normalized to ProductRecord values
+_AVAIL_MAP = {
+    'in_stock': 'in_stock',
+    'available': 'in_stock',
+    'out_of_stock': 'out_of_stock',
+    'unavailable': 'out_of_stock',
+}
+
+
+def _dig(data, *path):
+    """
+    Walk nested dicts by key path.
+    Returns None as soon as a key is missing or a non-dict is reached.
+    """
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+        if data is None:
+            return None
+    return data
+
+
 class WalmartCanadaScraper(BaseScraper):
     """
     Scraper for Walmart Canada (walmart.ca) using:
@@ -44,6 +88,9 @@ class WalmartCanadaScraper(BaseScraper):
         "access denied",
     ]
 
+    # All indicators as one alternation, so the page is scanned in a single pass
+    CAPTCHA_INDICATOR_PATTERN = '|'.join(re.escape(i) for i in CAPTCHA_INDICATORS)
+
     # PerimeterX specific selectors
     PX_CAPTCHA_SELECTORS = [
         "#px-captcha",
@@ -52,6 +99,9 @@ class WalmartCanadaScraper(BaseScraper):
         "iframe[src*='captcha']",
     ]
 
+    # Selector list joined so one DOM query covers every CAPTCHA selector
+    PX_CAPTCHA_SELECTOR = ", ".join(PX_CAPTCHA_SELECTORS)
+
     def __init__(self, config_path: Path, project_root: Path, headless: bool = True, fresh_start: bool = False):
         """
         Initialize Walmart Canada scraper.
@@ -66,6 +116,7 @@ class WalmartCanadaScraper(BaseScraper):
 
         self.headless = headless
         self.base_url = self.config['base_url']
+        self._browser_cfg = self._get_browser_config()
 
         # Playwright components
         self.playwright = None
@@ -73,6 +124,39 @@ class WalmartCanadaScraper(BaseScraper):
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
 
+        # Page pool for concurrent product scraping (one context, N pages)
+        concurrency_config = self.config.get('concurrency', {})
+        self.max_pages = max(1, concurrency_config.get('max_pages', 3))
+        self.pages: List[Page] = []
+        self._rate_limit_lock: Optional[asyncio.Lock] = None
+        self._scraped_count = 0
+
+        # Scraped records are written in batches rather than one append per product
+        output_config = self.config.get('output', {})
+        self.batch_size = max(1, output_config.get('batch_size', 100))
+        # Buffered records are lost on a crash, so flush (and checkpoint) at least
+        # this often; batch_size only caps how large a single write gets
+        self.checkpoint_interval = max(1, output_config.get('checkpoint_interval', 10))
+        self._record_buffer: List[ProductRecord] = []
+        self._last_buffered_url: Optional[str] = None
+
+        self.blocked_resource_types: Set[str] = set()
+
+        # Server-rendered pages can be read over plain HTTP; Playwright is the fallback
+        self.http_fast_path = self.config.get('extraction', {}).get('http_fast_path', True)
+        self._http = None
+
+        # Saved storage state (cookies, localStorage) lets warm runs skip warmup
+        session_cache_config = self.config.get('session_cache', {})
+        self.session_cache_enabled = session_cache_config.get('enabled', True)
+        self.session_cache_max_age = session_cache_config.get('max_age_hours', 24) * 3600
+        self.storage_state_path = self.project_root / '.cache' / f"{self.site_slug}_storage_state.json"
+        # Sidecar holding when the session was created: the state file itself is
+        # re-saved every run, so its mtime can't be used for expiry
+        self.storage_state_meta_path = self.storage_state_path.with_suffix('.meta.json')
+        self.storage_state_loaded = False
+        self._session_created_at = time.time()
+
         # Sitemap parser
         self.sitemap_parser = SitemapParser()
 
@@ -82,6 +166,10 @@ class WalmartCanadaScraper(BaseScraper):
         self.captcha_solve_attempts = 0
         self.captcha_solve_successes = 0
 
+        # Pre-generated unit-uniform samples, scaled per call in _human_delay
+        self._rng = np.random.default_rng()
+        self._delay_pool: Deque[float] = deque()
+
         # Session state
         self.session_warmed_up = False
         self.consecutive_errors = 0
@@ -115,16 +203,16 @@ class WalmartCanadaScraper(BaseScraper):
             ),
         }
 
-    def start_browser(self):
+    async def start_browser(self):
         """Initialize Playwright browser with stealth configuration."""
         if self.browser:
             return
 
         logging.info("Starting Playwright browser...")
-        self.playwright = sync_playwright().start()
+        self.playwright = await async_playwright().start()
 
         # Launch browser
-        self.browser = self.playwright.chromium.launch(
+        self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
             args=[
                 '--disable-blink-features=AutomationControlled',
@@ -135,8 +223,17 @@ class WalmartCanadaScraper(BaseScraper):
         )
 
         # Create context with fingerprint
-        config = self._get_browser_config()
-        self.context = self.browser.new_context(
+        # Reuse a recent saved session if available
+        storage_state = None
+        self._session_created_at = time.time()
+        if self._has_fresh_storage_state():
+            storage_state = str(self.storage_state_path)
+            self.storage_state_loaded = True
+            logging.info(f"Loading saved session state: {self.storage_state_path}")
+
+        config = self._browser_cfg
+        self.context = await self.browser.new_context(
+            storage_state=storage_state,
             viewport=config['viewport'],
             locale=config['locale'],
             timezone_id=config['timezone_id'],
@@ -147,8 +244,16 @@ class WalmartCanadaScraper(BaseScraper):
             }
         )
 
+        # Skip images/fonts/media: only the inline __NEXT_DATA__ script is needed
+        performance_config = self.config.get('performance', {})
+        if performance_config.get('block_resources', True):
+            self.blocked_resource_types = set(performance_config.get(
+                'blocked_resource_types', ['image', 'media', 'font', 'stylesheet']
+            ))
+            await self.context.route("**/*", self._route_request)
+
         # Apply stealth scripts to evade detection
-        self.context.add_init_script("""
+        await self.context.add_init_script("""
             // Override navigator.webdriver
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined
@@ -170,72 +275,162 @@ class WalmartCanadaScraper(BaseScraper):
             };
         """)
 
-        self.page = self.context.new_page()
-        logging.info("Browser started successfully")
+        # Page pool: the first page doubles as the warmup/default page
+        self.pages = [await self.context.new_page() for _ in range(self.max_pages)]
+        self.page = self.pages[0]
+
+        if self.http_fast_path:
+            self._http = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                headers={
+                    'User-Agent': config['user_agent'],
+                    'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8',
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                },
+                timeout=15,
+                follow_redirects=True
+            )
+        self._rate_limit_lock = asyncio.Lock()
+        logging.info(f"Browser started successfully ({self.max_pages} pages)")
+
+    async def _route_request(self, route):
+        """Abort requests for resource types that extraction never reads."""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _has_fresh_storage_state(self) -> bool:
+        """Check if a saved storage state exists and its session is within the max age."""
+        if not self.session_cache_enabled or not self.storage_state_path.exists():
+            return False
+        try:
+            with open(self.storage_state_meta_path, 'rb') as f:
+                created_at = _json_loads(f.read())['created_at']
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return time.time() - created_at < self.session_cache_max_age
 
-    def stop_browser(self):
+    def _invalidate_storage_state(self):
+        """Discard the saved session (e.g. after it gets blocked)."""
+        self.session_cache_enabled = False
+        self.storage_state_meta_path.unlink(missing_ok=True)
+        if self.storage_state_path.exists():
+            self.storage_state_path.unlink()
+            logging.info("Discarded saved session state")
+
+    async def stop_browser(self):
         """Close browser and cleanup."""
-        if self.page:
-            self.page.close()
-            self.page = None
+        if self.context and self.session_cache_enabled:
+            try:
+                self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+                await self.context.storage_state(path=str(self.storage_state_path))
+                # A reused session keeps its original creation time
+                if not self.storage_state_loaded:
+                    with open(self.storage_state_meta_path, 'w', encoding='utf-8') as f:
+                        json.dump({'created_at': self._session_created_at}, f)
+                logging.debug(f"Session state saved: {self.storage_state_path}")
+            except Exception as e:
+                logging.warning(f"Failed to save session state: {e}")
+
+        if self._http:
+            await self._http.aclose()
+            self._http = None
+        await self.captcha_solver.aclose()
+
+        for page in self.pages:
+            await page.close()
+        self.pages = []
+        self.page = None
         if self.context:
-            self.context.close()
+            await self.context.close()
             self.context = None
         if self.browser:
-            self.browser.close()
+            await self.browser.close()
             self.browser = None
         if self.playwright:
-            self.playwright.stop()
+            await self.playwright.stop()
             self.playwright = None
         logging.info("Browser stopped")
 
-    def _human_delay(self, min_seconds: float = 0.5, max_seconds: float = 2.0):
-        """Add human-like random delay."""
-        delay = random.uniform(min_seconds, max_seconds)
-        time.sleep(delay)
-
-    def _scroll_page(self):
-        """Simulate human scrolling behavior."""
-        if not self.page:
+    async def _sync_http_cookies(self):
+        """Copy the browser session's cookies into the fast-path HTTP client."""
+        if not self._http or not self.context:
             return
 
-        try:
-            # Get page height
-            height = self.page.evaluate("document.body.scrollHeight")
+        for cookie in await self.context.cookies([self.base_url]):
+            self._http.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
 
-            # Scroll in increments
-            current = 0
-            increment = random.randint(300, 500)
+    async def _human_delay(self, min_seconds: float = 0.5, max_seconds: float = 2.0):
+        """Add human-like random delay."""
+        if not self._delay_pool:
+            self._delay_pool.extend(self._rng.random(256).tolist())
+        delay = min_seconds + (max_seconds - min_seconds) * self._delay_pool.popleft()
+        await asyncio.sleep(delay)
 
-            while current < height * 0.7:  # Scroll to ~70% of page
-                current += increment
-                self.page.evaluate(f"window.scrollTo(0, {current})")
-                self._human_delay(0.1, 0.3)
+    async def _rate_limit(self):
+        """
+        Apply the shared rate limiter without blocking the event loop.
+        Waits are serialized so concurrent pages still respect one request budget.
+        """
+        async with self._rate_limit_lock:
+            await asyncio.to_thread(self.rate_limiter.adaptive_wait, self.consecutive_errors)
 
-            # Scroll back up a bit (human behavior)
-            if random.random() < 0.3:
-                scroll_back = random.randint(100, 300)
-                self.page.evaluate(f"window.scrollTo(0, {current - scroll_back})")
+    async def _scroll_page(self, page: Page):
+        """Simulate human scrolling behavior."""
+        try:
+            # Whole scroll routine runs in the page: one round-trip instead of one per step
+            await page.evaluate("""
+                async () => {
+                    const height = document.body.scrollHeight;
+                    const increment = 300 + Math.floor(Math.random() * 201);
+                    let current = 0;
+
+                    // Scroll in increments to ~70% of page
+                    while (current < height * 0.7) {
+                        current += increment;
+                        window.scrollTo(0, current);
+                        await new Promise(r => setTimeout(r, 100 + Math.random() * 200));
+                    }
+
+                    // Scroll back up a bit (human behavior)
+                    if (Math.random() < 0.3) {
+                        window.scrollTo(0, current - (100 + Math.floor(Math.random() * 201)));
+                    }
+                }
+            """)
 
         except Exception as e:
             logging.debug(f"Scroll failed: {e}")
 
-    def _is_blocked(self) -> bool:
-        """Check if current page shows a CAPTCHA or block."""
-        if not self.page:
-            return False
-
+    async def _is_blocked(self, page: Page) -> bool:
+        """Check if the given page shows a CAPTCHA or block."""
         try:
-            content = self.page.content().lower()
-            for indicator in self.CAPTCHA_INDICATORS:
-                if indicator in content:
-                    logging.warning(f"Block detected: found '{indicator}' in page")
-                    return True
+            # Match in the page so only the hit (not the whole DOM) crosses IPC.
+            # A ~2KB probe of title + visible text catches challenge pages; the full
+            # markup is scanned only when the page is nearly empty.
+            indicator = await page.evaluate("""
+                (pattern) => {
+                    const re = new RegExp(pattern, 'i');
+                    const probe = document.title + '|' + (document.body?.innerText || '').slice(0, 2000);
+                    let match = probe.match(re);
+                    if (!match && probe.length < 50) {
+                        match = document.documentElement.outerHTML.match(re);
+                    }
+                    return match ? match[0].toLowerCase() : null;
+                }
+            """, self.CAPTCHA_INDICATOR_PATTERN)
+            if indicator:
+                logging.warning(f"Block detected: found '{indicator}' in page")
+                return True
             return False
         except Exception:
             return False
 
-    def _extract_px_data(self) -> Optional[str]:
+    async def _extract_px_data(self, page: Page) -> Optional[str]:
         """
         Extract PerimeterX data blob from the page.
         This data is needed by CAPTCHA solving services.
@@ -243,28 +438,27 @@ class WalmartCanadaScraper(BaseScraper):
         Returns:
             PerimeterX data blob string, or None if not found
         """
-        if not self.page:
-            return None
-
         try:
-            # Try to get _px3 cookie
-            cookies = self.context.cookies()
+            # Try to get _px3 cookie (only this site's cookies cross IPC);
+            # the script scan below only runs on a cookie miss
+            cookies = await self.context.cookies([self.base_url])
             for cookie in cookies:
                 if cookie.get('name') == '_px3':
                     return cookie.get('value')
 
             # Try to extract from page scripts
-            px_data = self.page.evaluate("""
+            px_data = await page.evaluate("""
                 () => {
                     // Look for PerimeterX data in window object
                     if (window._pxUuid) return window._pxUuid;
                     if (window._pxVid) return window._pxVid;
 
                     // Look in script tags
+                    const UUID_RE = /["']([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})["']/i;
                     const scripts = document.querySelectorAll('script');
                     for (const script of scripts) {
                         const text = script.textContent || '';
-                        const match = text.match(/["']([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12})["']/i);
+                        const match = text.match(UUID_RE);
                         if (match) return match[1];
                     }
                     return null;
@@ -277,22 +471,14 @@ class WalmartCanadaScraper(BaseScraper):
             logging.debug(f"Failed to extract PX data: {e}")
             return None
 
-    def _find_captcha_element(self):
+    async def _find_captcha_element(self, page: Page):
         """Find the CAPTCHA element on the page."""
-        if not self.page:
+        try:
+            return await page.query_selector(self.PX_CAPTCHA_SELECTOR)
+        except Exception:
             return None
 
-        for selector in self.PX_CAPTCHA_SELECTORS:
-            try:
-                element = self.page.query_selector(selector)
-                if element:
-                    return element
-            except Exception:
-                continue
-
-        return None
-
-    def _handle_captcha(self) -> bool:
+    async def _handle_captcha(self, page: Page) -> bool:
         """
         Attempt to solve PerimeterX CAPTCHA challenge.
 
@@ -304,16 +490,16 @@ class WalmartCanadaScraper(BaseScraper):
             return False
 
         self.captcha_solve_attempts += 1
-        current_url = self.page.url
+        current_url = page.url
 
         logging.info(f"Attempting to solve PerimeterX CAPTCHA (attempt #{self.captcha_solve_attempts})")
 
         # Extract PerimeterX data blob
-        px_data = self._extract_px_data()
-        user_agent = self._get_browser_config().get('user_agent')
+        px_data = await self._extract_px_data(page)
+        user_agent = self._browser_cfg['user_agent']
 
-        # Call CAPTCHA solver
-        result = self.captcha_solver.solve_perimeterx(
+        # Call CAPTCHA solver (polls on the event loop, other pages keep working)
+        result = await self.captcha_solver.solve_perimeterx_async(
             site_url=current_url,
             data_blob=px_data,
             user_agent=user_agent
@@ -330,7 +516,7 @@ class WalmartCanadaScraper(BaseScraper):
         if result.token:
             try:
                 # Method 1: Set cookie with token
-                self.context.add_cookies([{
+                await self.context.add_cookies([{
                     'name': '_px3',
                     'value': result.token,
                     'domain': '.walmart.ca',
@@ -338,7 +524,7 @@ class WalmartCanadaScraper(BaseScraper):
                 }])
 
                 # Method 2: Try to inject via JavaScript
-                self.page.evaluate(f"""
+                await page.evaluate(f"""
                     (token) => {{
                         // Try setting various PerimeterX related variables
                         if (window._pxParam1) window._pxParam1 = token;
@@ -352,14 +538,14 @@ class WalmartCanadaScraper(BaseScraper):
                 """, result.token)
 
                 # Wait a moment for the solution to be processed
-                self._human_delay(1, 2)
+                await self._human_delay(1, 2)
 
                 # Reload the page to apply the new session
-                self.page.reload(wait_until='domcontentloaded', timeout=30000)
-                self._human_delay(2, 3)
+                await page.reload(wait_until='domcontentloaded', timeout=30000)
+                await self._human_delay(2, 3)
 
                 # Check if block is cleared
-                if not self._is_blocked():
+                if not await self._is_blocked(page):
                     logging.info("CAPTCHA bypass successful!")
                     return True
                 else:
@@ -372,11 +558,12 @@ class WalmartCanadaScraper(BaseScraper):
 
         return False
 
-    def _handle_block(self, url: str) -> bool:
+    async def _handle_block(self, page: Page, url: str) -> bool:
         """
         Handle a detected block/CAPTCHA.
 
         Args:
+            page: The page showing the block
             url: The URL that was blocked
 
         Returns:
@@ -386,16 +573,19 @@ class WalmartCanadaScraper(BaseScraper):
 
         # Try CAPTCHA solving if available
         if self.captcha_solver.is_available():
-            if self._handle_captcha():
+            if await self._handle_captcha(page):
                 return True
 
+        # This session is burned; don't reuse it on the next run
+        self._invalidate_storage_state()
+
         # If CAPTCHA solving failed or not available, apply backoff
         logging.info("Applying backoff delay...")
-        self._human_delay(10, 20)
+        await self._human_delay(10, 20)
 
         return False
 
-    def warmup_session(self):
+    async def warmup_session(self):
         """
         Warm up the browser session by visiting non-target pages.
         This helps build trust score with anti-bot systems.
@@ -407,6 +597,11 @@ class WalmartCanadaScraper(BaseScraper):
             self.session_warmed_up = True
             return
 
+        if self.storage_state_loaded:
+            logging.info("Reusing saved session state, skipping warmup")
+            self.session_warmed_up = True
+            return
+
         logging.info("Warming up session...")
         warmup_pages = self.config.get('warmup', {}).get('pages', ['/'])
 
@@ -415,17 +610,17 @@ class WalmartCanadaScraper(BaseScraper):
                 url = f"{self.base_url}{path}" if path.startswith('/') else path
                 logging.info(f"Visiting: {url}")
 
-                self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                self._human_delay(2, 4)
+                await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                await self._human_delay(2, 4)
 
-                if self._is_blocked():
+                if await self._is_blocked(self.page):
                     logging.warning("Block detected during warmup!")
-                    self._human_delay(5, 10)
+                    await self._human_delay(5, 10)
                     continue
 
                 # Simulate browsing
-                self._scroll_page()
-                self._human_delay(1, 3)
+                await self._scroll_page(self.page)
+                await self._human_delay(1, 3)
 
             except Exception as e:
                 logging.warning(f"Warmup page failed: {e}")
@@ -433,25 +628,54 @@ class WalmartCanadaScraper(BaseScraper):
         self.session_warmed_up = True
         logging.info("Session warmup complete")
 
-    def _extract_next_data(self) -> Optional[Dict]:
+    async def _extract_next_data(self, page: Page) -> Optional[Dict]:
         """
         Extract __NEXT_DATA__ JSON from page.
         This is the most reliable way to get product data from Walmart.
         """
-        if not self.page:
-            return None
-
         try:
-            # Find the __NEXT_DATA__ script tag
-            script = self.page.query_selector('script#__NEXT_DATA__')
-            if script:
-                json_text = script.inner_text()
-                return json.loads(json_text)
+            # Read the __NEXT_DATA__ script text in a single round-trip
+            json_text = await page.evaluate("""
+                () => {
+                    const script = document.getElementById('__NEXT_DATA__');
+                    return script ? script.textContent : null;
+                }
+            """)
+            if json_text:
+                return _json_loads(json_text)
         except Exception as e:
             logging.debug(f"Failed to extract __NEXT_DATA__: {e}")
 
         return None
 
+    async def _try_fast_path(self, product_url: str) -> Optional[Dict]:
+        """
+        Fetch a product page over plain HTTP and read __NEXT_DATA__ from the HTML.
+
+        Returns:
+            Parsed __NEXT_DATA__ JSON, or None if the page needs the browser
+            (non-200, challenge page, or no inline data)
+        """
+        try:
+            response = await self._http.get(product_url)
+        except httpx.HTTPError as e:
+            logging.debug(f"Fast path request failed: {e}")
+            return None
+
+        if response.status_code != 200:
+            logging.debug(f"Fast path got HTTP {response.status_code}")
+            return None
+
+        match = _NEXT_DATA_RE.search(response.text)
+        if not match:
+            return None
+
+        try:
+            return _json_loads(match.group(1))
+        except ValueError as e:
+            logging.debug(f"Fast path __NEXT_DATA__ unparseable: {e}")
+            return None
+
     def _parse_product_from_next_data(self, next_data: Dict, source_url: str) -> Optional[ProductRecord]:
         """
         Parse product data from __NEXT_DATA__ JSON.
@@ -465,16 +689,11 @@ class WalmartCanadaScraper(BaseScraper):
         """
         try:
             # Navigate to product data in the JSON structure
-            # Structure: props.pageProps.initialData.data.product
-            props = next_data.get('props', {})
-            page_props = props.get('pageProps', {})
-            initial_data = page_props.get('initialData', {})
-            data = initial_data.get('data', {})
-            product = data.get('product', {})
-
-            if not product:
-                # Try alternate paths
-                product = page_props.get('product', {})
+            # Structure: props.pageProps.initialData.data.product (or props.pageProps.product)
+            product = (
+                _dig(next_data, 'props', 'pageProps', 'initialData', 'data', 'product') or
+                _dig(next_data, 'props', 'pageProps', 'product')
+            )
 
             if not product:
                 logging.debug("No product data found in __NEXT_DATA__")
@@ -487,16 +706,16 @@ class WalmartCanadaScraper(BaseScraper):
 
             # Extract item ID from URL
             item_id = None
-            url_match = re.search(r'/ip/[^/]+/(\d+)', source_url)
+            url_match = _IP_ID_RE.search(source_url)
             if url_match:
                 item_id = url_match.group(1)
 
             # Price extraction
-            price = None
-            price_info = product.get('priceInfo', {})
-            if price_info:
-                current_price = price_info.get('currentPrice', {})
-                price = current_price.get('price') or current_price.get('priceValue')
+            price_info = product.get('priceInfo')
+            price = (
+                _dig(price_info, 'currentPrice', 'price') or
+                _dig(price_info, 'currentPrice', 'priceValue')
+            )
             if price is None:
                 price = product.get('price')
 
@@ -507,12 +726,8 @@ class WalmartCanadaScraper(BaseScraper):
             size_text = product.get('size') or product.get('weight') or product.get('quantity')
 
             # Unit price
-            unit_price = None
-            unit_price_uom = None
-            if price_info:
-                unit_price_info = price_info.get('unitPrice', {})
-                unit_price = unit_price_info.get('price')
-                unit_price_uom = unit_price_info.get('unit')
+            unit_price = _dig(price_info, 'unitPrice', 'price')
+            unit_price_uom = _dig(price_info, 'unitPrice', 'unit')
 
             # Image URL
             image_url = None
@@ -526,7 +741,7 @@ class WalmartCanadaScraper(BaseScraper):
             category_path = None
             categories = product.get('categories', [])
             if categories:
-                category_names = [c.get('name', '') for c in categories if c.get('name')]
+                category_names = [name for name in (_dig(c, 'name') for c in categories) if name]
                 if category_names:
                     category_path = ' > '.join(category_names)
 
@@ -534,11 +749,16 @@ class WalmartCanadaScraper(BaseScraper):
             availability = 'unknown'
             avail_status = product.get('availabilityStatus') or product.get('availability')
             if avail_status:
-                avail_lower = str(avail_status).lower()
-                if 'in_stock' in avail_lower or avail_lower == 'available':
-                    availability = 'in_stock'
-                elif 'out_of_stock' in avail_lower or avail_lower == 'unavailable':
-                    availability = 'out_of_stock'
+                avail_key = str(avail_status).lower().replace('-', '_')
+                availability = _AVAIL_MAP.get(avail_key)
+                # Substring fallback for compound values like ONLINE_IN_STOCK
+                if availability is None:
+                    if 'in_stock' in avail_key:
+                        availability = 'in_stock'
+                    elif 'out_of_stock' in avail_key:
+                        availability = 'out_of_stock'
+                    else:
+                        availability = 'unknown'
 
             # UPC/GTIN
             external_id = item_id or product.get('upc') or product.get('gtin') or product.get('sku')
@@ -567,36 +787,53 @@ class WalmartCanadaScraper(BaseScraper):
             logging.error(f"Failed to parse product from __NEXT_DATA__: {e}")
             return None
 
-    def scrape_product_page(self, product_url: str) -> Optional[ProductRecord]:
+    async def scrape_product_page(self, product_url: str,
+                                  page: Optional[Page] = None) -> Optional[ProductRecord]:
         """
         Scrape a single product detail page.
 
         Args:
             product_url: Product page URL
+            page: Page from the pool to use (defaults to the primary page)
 
         Returns:
             ProductRecord if successful, None otherwise
         """
         if not self.page:
-            self.start_browser()
-            self.warmup_session()
+            await self.start_browser()
+            await self.warmup_session()
+            await self._sync_http_cookies()
+
+        page = page or self.page
 
         try:
             # Apply rate limiting
-            self.rate_limiter.adaptive_wait(self.consecutive_errors)
+            await self._rate_limit()
 
             logging.info(f"Scraping: {product_url}")
-            self.page.goto(product_url, wait_until='domcontentloaded', timeout=45000)
+
+            # Fast path: no render, no JS. Challenge pages carry no product data,
+            # so anything short of a parsed product falls through to the browser.
+            if self._http:
+                next_data = await self._try_fast_path(product_url)
+                if next_data:
+                    product = self._parse_product_from_next_data(next_data, product_url)
+                    if product:
+                        self.consecutive_errors = 0
+                        return product
+                logging.debug("Fast path missed, loading page in browser")
+
+            await page.goto(product_url, wait_until='domcontentloaded', timeout=45000)
 
             # Wait for page to settle
-            self._human_delay(1, 2)
+            await self._human_delay(1, 2)
 
             # Check for blocks
-            if self._is_blocked():
+            if await self._is_blocked(page):
                 logging.warning(f"Blocked on product page: {product_url}")
 
                 # Try to handle the block (CAPTCHA solving)
-                if self._handle_block(product_url):
+                if await self._handle_block(page, product_url):
                     logging.info("Block bypassed, continuing extraction")
                 else:
                     self.consecutive_errors += 1
@@ -612,7 +849,7 @@ class WalmartCanadaScraper(BaseScraper):
             self.consecutive_errors = 0
 
             # Try to extract __NEXT_DATA__
-            next_data = self._extract_next_data()
+            next_data = await self._extract_next_data(page)
             if next_data:
                 product = self._parse_product_from_next_data(next_data, product_url)
                 if product:
@@ -621,7 +858,7 @@ class WalmartCanadaScraper(BaseScraper):
             # Fallback to DOM extraction if enabled
             if self.config.get('extraction', {}).get('fallback_to_dom', False):
                 logging.debug("Attempting DOM fallback extraction")
-                return self._extract_from_dom(product_url)
+                return await self._extract_from_dom(page, product_url)
 
             return None
 
@@ -637,35 +874,40 @@ class WalmartCanadaScraper(BaseScraper):
             self.stats['errors'] += 1
             return None
 
-    def _extract_from_dom(self, source_url: str) -> Optional[ProductRecord]:
+    async def _extract_from_dom(self, page: Page, source_url: str) -> Optional[ProductRecord]:
         """
         Fallback: Extract product data from DOM elements.
         Less reliable than __NEXT_DATA__ but works as backup.
         """
         try:
-            # Try common selectors
-            name_elem = self.page.query_selector('h1[data-testid="product-title"]') or \
-                       self.page.query_selector('h1.product-title') or \
-                       self.page.query_selector('h1')
-            name = name_elem.inner_text().strip() if name_elem else None
+            # Try common selectors (first match wins), read in a single round-trip
+            dom = await page.evaluate("""
+                () => {
+                    const first = selectors => selectors.map(s => document.querySelector(s)).find(Boolean);
+                    const nameElem = first(['h1[data-testid="product-title"]', 'h1.product-title', 'h1']);
+                    const priceElem = first(['[data-testid="price-current"]', '.price-current', '[itemprop="price"]']);
+                    return {
+                        name: nameElem ? nameElem.innerText.trim() : null,
+                        price: priceElem ? priceElem.innerText : null
+                    };
+                }
+            """)
+            name = dom['name']
 
             if not name:
                 return None
 
             # Price
             price = None
-            price_elem = self.page.query_selector('[data-testid="price-current"]') or \
-                        self.page.query_selector('.price-current') or \
-                        self.page.query_selector('[itemprop="price"]')
-            if price_elem:
-                price_text = price_elem.inner_text()
-                price_match = re.search(r'[\d,.]+', price_text.replace(',', ''))
+            price_text = dom['price']
+            if price_text:
+                price_match = _PRICE_NUM_RE.search(price_text.replace(',', ''))
                 if price_match:
                     price = float(price_match.group())
 
             # Item ID from URL
             item_id = None
-            url_match = re.search(r'/ip/[^/]+/(\d+)', source_url)
+            url_match = _IP_ID_RE.search(source_url)
             if url_match:
                 item_id = url_match.group(1)
 
@@ -693,10 +935,164 @@ class WalmartCanadaScraper(BaseScraper):
             logging.error(f"DOM extraction failed: {e}")
             return None
 
+    def _flush_records(self) -> int:
+        """
+        Write buffered records in one batch and checkpoint.
+
+        The checkpoint's last_url is the last product that was actually
+        buffered (and is now saved), never one still waiting to be scraped.
+
+        Returns:
+            Number of records saved
+        """
+        if not self._record_buffer:
+            return 0
+
+        saved = self.save_records_batch(self._record_buffer)
+        self._record_buffer = []
+        self._scraped_count += saved
+
+        last_url, self._last_buffered_url = self._last_buffered_url, None
+        self.save_checkpoint({'last_url': last_url} if last_url else None)
+        return saved
+
+    async def _scrape_one(self, product_url: str, page: Page,
+                          max_products: Optional[int] = None) -> bool:
+        """
+        Scrape one product on the given page and buffer it for saving.
+
+        Args:
+            product_url: Product page URL
+            page: Page from the pool to use
+            max_products: Stop scraping once this many products are saved
+
+        Returns:
+            True if a product was scraped, False otherwise
+        """
+        if max_products and self._scraped_count + len(self._record_buffer) >= max_products:
+            # Buffered records may still be dropped as duplicates; settle before stopping
+            self._flush_records()
+            if self._scraped_count >= max_products:
+                return False
+
+        product = await self.scrape_product_page(product_url, page)
+        if not product:
+            return False
+
+        self._record_buffer.append(product)
+        self._last_buffered_url = product_url
+        logging.info(f"Scraped: {product.name}")
+
+        if len(self._record_buffer) >= min(self.batch_size, self.checkpoint_interval):
+            self._flush_records()
+
+        return True
+
+    async def _produce_product_urls(self, queue: asyncio.Queue, sitemap_url: str,
+                                    max_products: Optional[int] = None) -> int:
+        """
+        Stream product URLs from the sitemap into the queue.
+        The blocking parser is advanced off the event loop so pages keep scraping.
+        Puts one None sentinel per consumer when done (not when cancelled).
+
+        Returns:
+            Number of product URLs queued
+        """
+        queued = 0
+        entries = self.sitemap_parser.iter_product_urls(
+            sitemap_url=sitemap_url,
+            max_urls=max_products,
+            url_filter=filter_walmart_product_urls,
+            # Only loc is used to scrape; skip lastmod/changefreq/priority
+            want_metadata=False
+        )
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                # Shielded so a cancelled run can still wait for the in-flight next()
+                pending = asyncio.ensure_future(asyncio.to_thread(next, entries, None))
+                entry = await asyncio.shield(pending)
+                if entry is None:
+                    break
+                await queue.put(entry)
+                queued += 1
+        except Exception as e:
+            logging.error(f"Failed to parse sitemap: {e}")
+        finally:
+            # Close the parser generator now rather than at GC time: its finally
+            # stops the prefetch pool and saves sitemap state. A generator can't
+            # be closed while another thread is still running it.
+            if pending is not None and not pending.done():
+                await asyncio.wait({pending})
+            try:
+                await asyncio.to_thread(entries.close)
+            except Exception as e:
+                logging.warning(f"Failed to close sitemap parser: {e}")
+
+        # Only reached when production ends normally: on cancellation the
+        # consumers are cancelled too and can't drain the full queue, so a
+        # sentinel put would wait forever
+        for _ in self.pages:
+            await queue.put(None)
+
+        logging.info(f"Found {queued} product URLs")
+        return queued
+
+    async def _consume_product_urls(self, queue: asyncio.Queue, page: Page,
+                                    max_products: Optional[int] = None):
+        """Scrape queued product URLs on one page until a None sentinel arrives."""
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                break
+
+            try:
+                await self._scrape_one(entry.loc, page, max_products)
+            except Exception as e:
+                # Keep draining the queue so the producer never blocks
+                logging.error(f"Product task failed for {entry.loc}: {e}")
+
+    async def _scrape_from_sitemap_async(self, sitemap_url: str,
+                                         max_products: Optional[int] = None) -> int:
+        """Async implementation of scrape_from_sitemap (owns the browser lifecycle)."""
+        # Start browser and warm up
+        await self.start_browser()
+
+        try:
+            await self.warmup_session()
+            await self._sync_http_cookies()
+
+            self._scraped_count = 0
+            queue: asyncio.Queue = asyncio.Queue(maxsize=2 * len(self.pages))
+
+            # One producer streams the sitemap while one consumer per page scrapes
+            results = await asyncio.gather(
+                self._produce_product_urls(queue, sitemap_url, max_products),
+                *(self._consume_product_urls(queue, page, max_products) for page in self.pages),
+                return_exceptions=True
+            )
+
+            for result in results:
+                if isinstance(result, Exception):
+                    logging.error(f"Sitemap task failed: {result}")
+
+            if not results[0]:
+                logging.warning("No product URLs found in sitemap")
+
+            self._flush_records()
+            return self._scraped_count
+
+        finally:
+            # Don't lose buffered records if the run is interrupted
+            self._flush_records()
+            await self.stop_browser()
+
     def scrape_from_sitemap(self, sitemap_url: Optional[str] = None,
                            max_products: Optional[int] = None) -> int:
         """
         Scrape products discovered from sitemap.
+        Product pages are scraped concurrently on a pool of pages
+        (config: concurrency.max_pages).
 
         Args:
             sitemap_url: Sitemap URL (uses config if not provided)
@@ -715,46 +1111,7 @@ class WalmartCanadaScraper(BaseScraper):
 
         logging.info(f"Discovering products from sitemap: {sitemap_url}")
 
-        # Start browser and warm up
-        self.start_browser()
-        self.warmup_session()
-
-        # Get product URLs from sitemap
-        try:
-            product_entries = self.sitemap_parser.get_product_urls(
-                sitemap_url=sitemap_url,
-                max_urls=max_products
-            )
-        except Exception as e:
-            logging.error(f"Failed to parse sitemap: {e}")
-            return 0
-
-        if not product_entries:
-            logging.warning("No product URLs found in sitemap")
-            return 0
-
-        logging.info(f"Found {len(product_entries)} product URLs")
-        scraped_count = 0
-
-        for entry in product_entries:
-            if max_products and scraped_count >= max_products:
-                break
-
-            # Skip if URL doesn't pass filter
-            if not filter_walmart_product_urls(entry.loc):
-                continue
-
-            product = self.scrape_product_page(entry.loc)
-            if product:
-                if self.save_record(product):
-                    scraped_count += 1
-                    logging.info(f"Scraped {scraped_count}: {product.name}")
-
-            # Checkpoint periodically
-            if scraped_count > 0 and scraped_count % 10 == 0:
-                self.save_checkpoint({'last_url': entry.loc})
-
-        return scraped_count
+        return asyncio.run(self._scrape_from_sitemap_async(sitemap_url, max_products))
 
     def scrape_category(self, category_url: str, max_pages: Optional[int] = None) -> int:
         """
@@ -785,13 +1142,11 @@ class WalmartCanadaScraper(BaseScraper):
 
         logging.info(f"Running demo scrape (max {max_products} products)...")
 
-        try:
-            count = self.scrape_from_sitemap(max_products=max_products)
-            self.print_stats()
-            self.export_to_csv()
-            return count
-        finally:
-            self.stop_browser()
+        # Browser is started and stopped inside the sitemap run
+        count = self.scrape_from_sitemap(max_products=max_products)
+        self.print_stats()
+        self.export_to_csv()
+        return count
 
 
 def main():
@@ -835,8 +1190,6 @@ def main():
     except Exception as e:
         logging.error(f"Scraping failed: {e}")
         raise
-    finally:
-        scraper.stop_browser()
 
 
 if __name__ == '__main__':
@@ -1,24 +1,36 @@
 """
 Utility modules for scrapers.
+
+Exports are imported lazily on first access (PEP 562), so importing one
+utility doesn't pull in the dependencies of the others.
 """
 
-from scrapers.utils.sitemap_parser import SitemapParser, SitemapEntry
-from scrapers.utils.captcha_solver import (
-    CaptchaSolverManager,
-    CaptchaSolverFactory,
-    CaptchaSolution,
-    CaptchaType,
-    TwoCaptchaSolver,
-    CapSolver,
-)
-
-__all__ = [
-    'SitemapParser',
-    'SitemapEntry',
-    'CaptchaSolverManager',
-    'CaptchaSolverFactory',
-    'CaptchaSolution',
-    'CaptchaType',
-    'TwoCaptchaSolver',
-    'CapSolver',
-]
+import importlib
+
+_LAZY_EXPORTS = {
+    'SitemapParser': 'scrapers.utils.sitemap_parser',
+    'SitemapEntry': 'scrapers.utils.sitemap_parser',
+    'CompactSitemapEntry': 'scrapers.utils.sitemap_parser',
+    'CaptchaSolverManager': 'scrapers.utils.captcha_solver',
+    'CaptchaSolverFactory': 'scrapers.utils.captcha_solver',
+    'CaptchaSolution': 'scrapers.utils.captcha_solver',
+    'CaptchaType': 'scrapers.utils.captcha_solver',
+    'TwoCaptchaSolver': 'scrapers.utils.captcha_solver',
+    'CapSolver': 'scrapers.utils.captcha_solver',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
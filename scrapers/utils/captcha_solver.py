@@ -9,18 +9,197 @@ Supports multiple CAPTCHA solving services for bypassing anti-bot challenges:
 Handles PerimeterX "Press and Hold" challenges and other CAPTCHA types.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import random
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Dict, Optional, Any
-
-import requests
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
+from urllib.parse import urlparse
+
+import httpx
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Optional: persist solved CAPTCHAs across runs
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Provider APIs speak HTTP/2, so a handful of connections carries every
+# concurrent create/poll request as multiplexed streams
+HTTP_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+HTTP_RETRIES = 3  # retries on connection failures and on RETRY_STATUSES
+HTTP_RETRY_BACKOFF = 0.5  # seconds, doubled per retry
+# Only idempotent requests are retried on a 5xx: re-sending a task-creation
+# POST could pay for the same CAPTCHA twice
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Connection pools shared by every solver instance, created on first use.
+# Async clients are bound to an event loop, so there is one per loop: each
+# _run_sync() call (one asyncio.run() per thread) gets and closes its own.
+_shared_client: Optional[httpx.Client] = None
+_shared_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_shared_clients_lock = threading.Lock()
+
+T = TypeVar('T')
+
+# (site_url, data_blob, user_agent)
+PerimeterXJob = Tuple[str, Optional[str], Optional[str]]
+
+# Set by the caller to abandon a solve; either kind works since only is_set() is used
+CancelEvent = Union[asyncio.Event, threading.Event]
+
+
+def _run_sync(coro: Awaitable[T], cleanup: Callable[[], Awaitable[None]]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    Async HTTP clients are bound to the event loop, so cleanup closes them
+    before asyncio.run() tears the loop down.
+    """
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await cleanup()
+
+    return asyncio.run(runner())
+
+
+class _SolveCancelled(Exception):
+    """Raised into a pending solve when its cancel event is set."""
+
+
+def _should_retry(request: httpx.Request, response: httpx.Response, attempt: int) -> bool:
+    """Whether a response is a transient server error worth retrying."""
+    return (
+        attempt < HTTP_RETRIES
+        and response.status_code in RETRY_STATUSES
+        and request.method in RETRY_METHODS
+    )
+
+
+class _RetryTransport(httpx.BaseTransport):
+    """Retries idempotent requests on 5xx with exponential backoff."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = self._transport.handle_request(request)
+            if not _should_retry(request, response, attempt):
+                return response
+            response.close()
+            time.sleep(HTTP_RETRY_BACKOFF * 2 ** attempt)
+            attempt += 1
+
+    def close(self):
+        self._transport.close()
+
+
+class _AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of _RetryTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = await self._transport.handle_async_request(request)
+            if not _should_retry(request, response, attempt):
+                return response
+            await response.aclose()
+            await asyncio.sleep(HTTP_RETRY_BACKOFF * 2 ** attempt)
+            attempt += 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def _get_shared_client() -> httpx.Client:
+    """Get the shared blocking HTTP client (httpx.Client is thread-safe)."""
+    global _shared_client
+    with _shared_clients_lock:
+        if _shared_client is None or _shared_client.is_closed:
+            _shared_client = httpx.Client(
+                timeout=30,
+                transport=_RetryTransport(httpx.HTTPTransport(
+                    http2=HTTP2_AVAILABLE,
+                    limits=HTTP_LIMITS,
+                    retries=HTTP_RETRIES
+                ))
+            )
+        return _shared_client
+
+
+def _get_shared_async_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _shared_clients_lock:
+        client = _shared_async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=30,
+                transport=_AsyncRetryTransport(httpx.AsyncHTTPTransport(
+                    http2=HTTP2_AVAILABLE,
+                    limits=HTTP_LIMITS,
+                    retries=HTTP_RETRIES
+                ))
+            )
+            _shared_async_clients[loop] = client
+        return client
+
+
+async def _close_shared_async_client():
+    """Close the running loop's async HTTP client (other loops' clients are untouched)."""
+    with _shared_clients_lock:
+        client = _shared_async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _close_shared_client():
+    """Close the shared blocking HTTP client (it is recreated on next use)."""
+    global _shared_client
+    with _shared_clients_lock:
+        client, _shared_client = _shared_client, None
+    if client is not None:
+        client.close()
+
 
 class CaptchaType(Enum):
     """Supported CAPTCHA types."""
@@ -32,7 +211,7 @@ class CaptchaType(Enum):
     IMAGE = "image"
 
 
-@dataclass
+@dataclass(slots=True)
 class CaptchaSolution:
     """Result from a CAPTCHA solving attempt."""
     success: bool
@@ -47,36 +226,107 @@ class CaptchaSolution:
 class CaptchaSolverBase(ABC):
     """Abstract base class for CAPTCHA solvers."""
 
-    def __init__(self, api_key: str, timeout: int = 120):
+    POLL_BASE_DELAY = 1.0  # first backoff step (seconds)
+
+    def __init__(self, api_key: str, timeout: int = 120,
+                 session: Optional[httpx.Client] = None):
         """
         Initialize solver.
 
         Args:
             api_key: API key for the service
             timeout: Maximum time to wait for solution (seconds)
+            session: Optional HTTP client for blocking calls (defaults to the
+                module-wide shared client)
         """
         self.api_key = api_key
         self.timeout = timeout
-        self.session = requests.Session()
+        self.poll_interval = 5  # upper bound on seconds between status checks
+        self._session = session
+
+    @property
+    def session(self) -> httpx.Client:
+        """HTTP client for blocking calls."""
+        return self._session or _get_shared_client()
+
+    def _poll_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter, capped at poll_interval.
+        Early polls fire quickly for fast solves, and the jitter keeps
+        parallel solvers from polling in lockstep.
+        """
+        return random.uniform(0, min(self.poll_interval, self.POLL_BASE_DELAY * 2 ** min(attempt, 16)))
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the async HTTP client for the running event loop."""
+        return _get_shared_async_client()
+
+    async def aclose(self):
+        """Close the running event loop's async HTTP client."""
+        await _close_shared_async_client()
 
     @abstractmethod
-    def solve_perimeterx(self, site_url: str, data_blob: Optional[str] = None,
-                         user_agent: Optional[str] = None) -> CaptchaSolution:
+    async def solve_perimeterx_async(self, site_url: str, data_blob: Optional[str] = None,
+                                     user_agent: Optional[str] = None,
+                                     cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """Solve PerimeterX Press and Hold challenge."""
         pass
 
     @abstractmethod
-    def solve_recaptcha_v2(self, site_url: str, site_key: str,
-                           invisible: bool = False) -> CaptchaSolution:
+    async def solve_recaptcha_v2_async(self, site_url: str, site_key: str,
+                                       invisible: bool = False,
+                                       cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """Solve reCAPTCHA v2."""
         pass
 
+    @abstractmethod
+    async def solve_hcaptcha_async(self, site_url: str, site_key: str,
+                                   cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Solve hCaptcha."""
+        pass
+
+    async def solve_perimeterx_batch(self, jobs: List[PerimeterXJob]) -> List[CaptchaSolution]:
+        """
+        Solve several PerimeterX challenges at once.
+
+        All tasks are submitted together and polled concurrently, so K
+        challenges take roughly one solve time instead of K.
+        """
+        return list(await asyncio.gather(*(self.solve_perimeterx_async(*job) for job in jobs)))
+
+    def solve_perimeterx(self, site_url: str, data_blob: Optional[str] = None,
+                         user_agent: Optional[str] = None,
+                         cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Solve PerimeterX Press and Hold challenge (blocking)."""
+        return _run_sync(self.solve_perimeterx_async(site_url, data_blob, user_agent, cancel_event), self.aclose)
+
+    def solve_recaptcha_v2(self, site_url: str, site_key: str,
+                           invisible: bool = False,
+                           cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Solve reCAPTCHA v2 (blocking)."""
+        return _run_sync(self.solve_recaptcha_v2_async(site_url, site_key, invisible, cancel_event), self.aclose)
+
+    def solve_hcaptcha(self, site_url: str, site_key: str,
+                       cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Solve hCaptcha (blocking)."""
+        return _run_sync(self.solve_hcaptcha_async(site_url, site_key, cancel_event), self.aclose)
+
     @abstractmethod
     def get_balance(self) -> float:
         """Get account balance."""
         pass
 
 
+@dataclass(slots=True)
+class _PollState:
+    """2Captcha polling bookkeeping for one event loop."""
+    pending: Dict[str, asyncio.Future] = field(default_factory=dict)  # task ID -> Future
+    solo_tasks: Set[str] = field(default_factory=set)
+    cancel_events: Dict[str, CancelEvent] = field(default_factory=dict)
+    poller: Optional[asyncio.Task] = None
+    attempt: int = 0
+
+
 class TwoCaptchaSolver(CaptchaSolverBase):
     """
     2Captcha CAPTCHA solving service integration.
@@ -85,12 +335,36 @@ class TwoCaptchaSolver(CaptchaSolverBase):
     """
 
     BASE_URL = "https://2captcha.com"
-
-    def __init__(self, api_key: str, timeout: int = 120):
-        super().__init__(api_key, timeout)
-        self.poll_interval = 5  # seconds between status checks
-
-    def _create_task(self, task_data: Dict) -> Optional[str]:
+    _IN_URL = f"{BASE_URL}/in.php"
+    _RES_URL = f"{BASE_URL}/res.php"
+
+    # Static task fields; per-call fields are merged in
+    _PERIMETERX_BASE = {"method": "funcaptcha", "publickey": "px"}  # PerimeterX identifier
+    _RECAPTCHA_V2_BASE = {"method": "userrecaptcha"}
+    _HCAPTCHA_BASE = {"method": "hcaptcha"}
+
+    def __init__(self, api_key: str, timeout: int = 120,
+                 session: Optional[httpx.Client] = None):
+        super().__init__(api_key, timeout, session)
+        self.poll_interval = 5  # backoff cap (seconds)
+
+        # Futures and the poller belong to one event loop, so sync callers in
+        # different threads (one asyncio.run() each) get separate state
+        self._poll_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PollState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._poll_states_lock = threading.Lock()
+
+    def _poll_state(self) -> _PollState:
+        """Get the polling state for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._poll_states_lock:
+            state = self._poll_states.get(loop)
+            if state is None:
+                state = self._poll_states[loop] = _PollState()
+            return state
+
+    async def _create_task(self, task_data: Dict) -> Optional[str]:
         """Create a CAPTCHA solving task."""
         payload = {
             "key": self.api_key,
@@ -99,73 +373,144 @@ class TwoCaptchaSolver(CaptchaSolverBase):
         }
 
         try:
-            response = self.session.post(
-                f"{self.BASE_URL}/in.php",
-                data=payload,
-                timeout=30
+            response = await self._get_async_client().post(
+                self._IN_URL,
+                data=payload
             )
-            result = response.json()
+            result = _json_loads(response.content)
 
             if result.get("status") == 1:
                 task_id = result.get("request")
-                logger.info(f"2Captcha task created: {task_id}")
+                logger.info("2Captcha task created: %s", task_id)
                 return task_id
             else:
-                logger.error(f"2Captcha task creation failed: {result.get('request')}")
+                logger.error("2Captcha task creation failed: %s", result.get('request'))
                 return None
 
         except Exception as e:
-            logger.error(f"2Captcha API error: {e}")
+            logger.error("2Captcha API error: %s", e)
             return None
 
-    def _get_result(self, task_id: str) -> CaptchaSolution:
-        """Poll for task result."""
-        start_time = time.time()
-
-        while time.time() - start_time < self.timeout:
-            try:
-                response = self.session.get(
-                    f"{self.BASE_URL}/res.php",
-                    params={
-                        "key": self.api_key,
-                        "action": "get",
-                        "id": task_id,
-                        "json": 1
-                    },
-                    timeout=30
-                )
-                result = response.json()
-
-                if result.get("status") == 1:
-                    solve_time = time.time() - start_time
-                    logger.info(f"2Captcha solved in {solve_time:.1f}s")
-                    return CaptchaSolution(
-                        success=True,
-                        token=result.get("request"),
-                        task_id=task_id,
-                        solve_time=solve_time
-                    )
-                elif result.get("request") == "CAPCHA_NOT_READY":
-                    time.sleep(self.poll_interval)
-                else:
-                    return CaptchaSolution(
-                        success=False,
-                        error=result.get("request"),
-                        task_id=task_id
-                    )
+    async def _get_result(self, task_id: str, batchable: bool = True,
+                          cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """
+        Wait for a task result.
 
-            except Exception as e:
-                logger.error(f"2Captcha polling error: {e}")
-                time.sleep(self.poll_interval)
+        Pending tasks are polled together by a single background poller, so
+        N concurrent solves cost one res.php request per tick instead of N.
 
+        Args:
+            task_id: Task ID returned by in.php
+            batchable: Whether the answer can be read from a multi-id request.
+                Multi-id answers are '|'-separated, so tokens that contain '|'
+                (FunCaptcha) must be polled on their own.
+            cancel_event: Stops waiting once set (checked every poll tick)
+        """
+        state = self._poll_state()
+        future = asyncio.get_running_loop().create_future()
+        state.pending[task_id] = future
+        if not batchable:
+            state.solo_tasks.add(task_id)
+        if cancel_event is not None:
+            state.cancel_events[task_id] = cancel_event
+        state.attempt = 0  # restart backoff so the new task is checked soon
+
+        if state.poller is None or state.poller.done():
+            state.poller = asyncio.create_task(self._poll_pending(state))
+
+        start_time = time.monotonic()
+        try:
+            token = await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return CaptchaSolution(
+                success=False,
+                error="Timeout waiting for solution",
+                task_id=task_id
+            )
+        except _SolveCancelled:
+            logger.info("2Captcha task %s cancelled", task_id)
+            return CaptchaSolution(success=False, error="Cancelled", task_id=task_id)
+        except RuntimeError as e:
+            return CaptchaSolution(success=False, error=str(e), task_id=task_id)
+        finally:
+            state.pending.pop(task_id, None)
+            state.solo_tasks.discard(task_id)
+            state.cancel_events.pop(task_id, None)
+
+        solve_time = time.monotonic() - start_time
+        logger.info("2Captcha solved in %.1fs", solve_time)
         return CaptchaSolution(
-            success=False,
-            error="Timeout waiting for solution",
-            task_id=task_id
+            success=True,
+            token=token,
+            task_id=task_id,
+            solve_time=solve_time
         )
 
-    def solve_perimeterx(self, site_url: str, data_blob: Optional[str] = None,
-                         user_agent: Optional[str] = None) -> CaptchaSolution:
+    async def _poll_pending(self, state: _PollState):
+        """Poll all of this loop's pending tasks until none are left."""
+        client = self._get_async_client()
+
+        while state.pending:
+            await asyncio.sleep(self._poll_delay(state.attempt))
+            state.attempt += 1
+
+            for task_id, event in list(state.cancel_events.items()):
+                future = state.pending.get(task_id)
+                if event.is_set() and future is not None and not future.done():
+                    future.set_exception(_SolveCancelled())
+
+            active = [t for t, future in state.pending.items() if not future.done()]
+            batch = [t for t in active if t not in state.solo_tasks]
+            polls = [self._poll_tasks(state, client, [t]) for t in active if t in state.solo_tasks]
+            if batch:
+                polls.append(self._poll_tasks(state, client, batch))
+
+            await asyncio.gather(*polls)
+
+    async def _poll_tasks(self, state: _PollState, client: httpx.AsyncClient, task_ids: List[str]):
+        """Fetch results for one or more tasks and resolve their futures."""
+        params = {"key": self.api_key, "action": "get", "json": 1}
+        if len(task_ids) == 1:
+            params["id"] = task_ids[0]
+        else:
+            params["ids"] = ",".join(task_ids)
+
+        try:
+            response = await client.get(self._RES_URL, params=params)
+            result = _json_loads(response.content)
+        except Exception as e:
+            logger.error("2Captcha polling error: %s", e)
+            return
+
+        answer = str(result.get("request", ""))
+        if len(task_ids) == 1:
+            answers = [answer]
+        elif result.get("status") == 1:
+            answers = answer.split("|")
+        else:
+            # Batch-wide status such as CAPCHA_NOT_READY or an account error
+            answers = [answer] * len(task_ids)
+
+        for task_id, answer in zip(task_ids, answers):
+            future = state.pending.get(task_id)
+            if future is None or future.done() or answer == "CAPCHA_NOT_READY":
+                continue
+            if result.get("status") == 1 and not answer.startswith("ERROR"):
+                future.set_result(answer)
+            else:
+                future.set_exception(RuntimeError(answer))
+
+    async def aclose(self):
+        """Stop the running loop's poller and close its async HTTP client."""
+        with self._poll_states_lock:
+            state = self._poll_states.pop(asyncio.get_running_loop(), None)
+        if state is not None and state.poller is not None:
+            state.poller.cancel()
+        await super().aclose()
+
+    async def solve_perimeterx_async(self, site_url: str, data_blob: Optional[str] = None,
+                                     user_agent: Optional[str] = None,
+                                     cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """
         Solve PerimeterX "Press and Hold" challenge.
 
@@ -180,14 +525,10 @@ class TwoCaptchaSolver(CaptchaSolverBase):
         Returns:
             CaptchaSolution with token or error
         """
-        logger.info(f"Solving PerimeterX challenge for {site_url}")
+        logger.info("Solving PerimeterX challenge for %s", site_url)
 
         # 2Captcha treats PerimeterX as a custom task
-        task_data = {
-            "method": "funcaptcha",
-            "publickey": "px",  # PerimeterX identifier
-            "pageurl": site_url,
-        }
+        task_data = {**self._PERIMETERX_BASE, "pageurl": site_url}
 
         if data_blob:
             task_data["data[blob]"] = data_blob
@@ -195,14 +536,15 @@ class TwoCaptchaSolver(CaptchaSolverBase):
         if user_agent:
             task_data["userAgent"] = user_agent
 
-        task_id = self._create_task(task_data)
+        task_id = await self._create_task(task_data)
         if not task_id:
             return CaptchaSolution(success=False, error="Failed to create task")
 
-        return self._get_result(task_id)
+        return await self._get_result(task_id, batchable=False, cancel_event=cancel_event)
 
-    def solve_recaptcha_v2(self, site_url: str, site_key: str,
-                           invisible: bool = False) -> CaptchaSolution:
+    async def solve_recaptcha_v2_async(self, site_url: str, site_key: str,
+                                       invisible: bool = False,
+                                       cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """
         Solve reCAPTCHA v2.
 
@@ -214,44 +556,37 @@ class TwoCaptchaSolver(CaptchaSolverBase):
         Returns:
             CaptchaSolution with token
         """
-        logger.info(f"Solving reCAPTCHA v2 for {site_url}")
+        logger.info("Solving reCAPTCHA v2 for %s", site_url)
 
-        task_data = {
-            "method": "userrecaptcha",
-            "googlekey": site_key,
-            "pageurl": site_url,
-        }
+        task_data = {**self._RECAPTCHA_V2_BASE, "googlekey": site_key, "pageurl": site_url}
 
         if invisible:
             task_data["invisible"] = 1
 
-        task_id = self._create_task(task_data)
+        task_id = await self._create_task(task_data)
         if not task_id:
             return CaptchaSolution(success=False, error="Failed to create task")
 
-        return self._get_result(task_id)
+        return await self._get_result(task_id, cancel_event=cancel_event)
 
-    def solve_hcaptcha(self, site_url: str, site_key: str) -> CaptchaSolution:
+    async def solve_hcaptcha_async(self, site_url: str, site_key: str,
+                                   cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """Solve hCaptcha."""
-        logger.info(f"Solving hCaptcha for {site_url}")
+        logger.info("Solving hCaptcha for %s", site_url)
 
-        task_data = {
-            "method": "hcaptcha",
-            "sitekey": site_key,
-            "pageurl": site_url,
-        }
+        task_data = {**self._HCAPTCHA_BASE, "sitekey": site_key, "pageurl": site_url}
 
-        task_id = self._create_task(task_data)
+        task_id = await self._create_task(task_data)
         if not task_id:
             return CaptchaSolution(success=False, error="Failed to create task")
 
-        return self._get_result(task_id)
+        return await self._get_result(task_id, cancel_event=cancel_event)
 
     def get_balance(self) -> float:
         """Get account balance in USD."""
         try:
             response = self.session.get(
-                f"{self.BASE_URL}/res.php",
+                self._RES_URL,
                 params={
                     "key": self.api_key,
                     "action": "getbalance",
@@ -259,13 +594,13 @@ class TwoCaptchaSolver(CaptchaSolverBase):
                 },
                 timeout=30
             )
-            result = response.json()
+            result = _json_loads(response.content)
 
             if result.get("status") == 1:
                 return float(result.get("request", 0))
 
         except Exception as e:
-            logger.error(f"Failed to get 2Captcha balance: {e}")
+            logger.error("Failed to get 2Captcha balance: %s", e)
 
         return 0.0
 
@@ -278,12 +613,21 @@ class CapSolver(CaptchaSolverBase):
     """
 
     BASE_URL = "https://api.capsolver.com"
-
-    def __init__(self, api_key: str, timeout: int = 120):
-        super().__init__(api_key, timeout)
+    _CREATE_URL = f"{BASE_URL}/createTask"
+    _RESULT_URL = f"{BASE_URL}/getTaskResult"
+    _BALANCE_URL = f"{BASE_URL}/getBalance"
+
+    # Static task fields; per-call fields are merged in
+    _PERIMETERX_BASE = {"type": "AntiPerimeterXTask"}
+    _RECAPTCHA_V2_BASE = {"type": "ReCaptchaV2TaskProxyLess"}
+    _HCAPTCHA_BASE = {"type": "HCaptchaTaskProxyLess"}
+
+    def __init__(self, api_key: str, timeout: int = 120,
+                 session: Optional[httpx.Client] = None):
+        super().__init__(api_key, timeout, session)
         self.poll_interval = 3  # CapSolver is typically faster
 
-    def _create_task(self, task: Dict) -> Optional[str]:
+    async def _create_task(self, task: Dict) -> Optional[str]:
         """Create a CAPTCHA solving task."""
         payload = {
             "clientKey": self.api_key,
@@ -291,40 +635,48 @@ class CapSolver(CaptchaSolverBase):
         }
 
         try:
-            response = self.session.post(
-                f"{self.BASE_URL}/createTask",
-                json=payload,
-                timeout=30
+            response = await self._get_async_client().post(
+                self._CREATE_URL,
+                content=_json_dumps(payload),
+                headers=JSON_HEADERS
             )
-            result = response.json()
+            result = _json_loads(response.content)
 
             if result.get("errorId") == 0:
                 task_id = result.get("taskId")
-                logger.info(f"CapSolver task created: {task_id}")
+                logger.info("CapSolver task created: %s", task_id)
                 return task_id
             else:
-                logger.error(f"CapSolver task creation failed: {result.get('errorDescription')}")
+                logger.error("CapSolver task creation failed: %s", result.get('errorDescription'))
                 return None
 
         except Exception as e:
-            logger.error(f"CapSolver API error: {e}")
+            logger.error("CapSolver API error: %s", e)
             return None
 
-    def _get_result(self, task_id: str) -> CaptchaSolution:
-        """Poll for task result."""
-        start_time = time.time()
+    async def _get_result(self, task_id: str,
+                          cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Poll for task result until solved, failed, timed out or cancelled."""
+        client = self._get_async_client()
+        start_time = time.monotonic()
+        deadline = start_time + self.timeout
+        attempt = 0
+
+        while time.monotonic() < deadline:
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info("CapSolver task %s cancelled", task_id)
+                return CaptchaSolution(success=False, error="Cancelled", task_id=task_id)
 
-        while time.time() - start_time < self.timeout:
             try:
-                response = self.session.post(
-                    f"{self.BASE_URL}/getTaskResult",
-                    json={
+                response = await client.post(
+                    self._RESULT_URL,
+                    content=_json_dumps({
                         "clientKey": self.api_key,
                         "taskId": task_id
-                    },
-                    timeout=30
+                    }),
+                    headers=JSON_HEADERS
                 )
-                result = response.json()
+                result = _json_loads(response.content)
 
                 if result.get("errorId") != 0:
                     return CaptchaSolution(
@@ -337,8 +689,8 @@ class CapSolver(CaptchaSolverBase):
 
                 if status == "ready":
                     solution = result.get("solution", {})
-                    solve_time = time.time() - start_time
-                    logger.info(f"CapSolver solved in {solve_time:.1f}s")
+                    solve_time = time.monotonic() - start_time
+                    logger.info("CapSolver solved in %.1fs", solve_time)
 
                     # Extract token based on CAPTCHA type
                     token = (
@@ -355,7 +707,8 @@ class CapSolver(CaptchaSolverBase):
                         solve_time=solve_time
                     )
                 elif status == "processing":
-                    time.sleep(self.poll_interval)
+                    await asyncio.sleep(self._poll_delay(attempt))
+                    attempt += 1
                 else:
                     return CaptchaSolution(
                         success=False,
@@ -364,8 +717,9 @@ class CapSolver(CaptchaSolverBase):
                     )
 
             except Exception as e:
-                logger.error(f"CapSolver polling error: {e}")
-                time.sleep(self.poll_interval)
+                logger.error("CapSolver polling error: %s", e)
+                await asyncio.sleep(self._poll_delay(attempt))
+                attempt += 1
 
         return CaptchaSolution(
             success=False,
@@ -373,8 +727,9 @@ class CapSolver(CaptchaSolverBase):
             task_id=task_id
         )
 
-    def solve_perimeterx(self, site_url: str, data_blob: Optional[str] = None,
-                         user_agent: Optional[str] = None) -> CaptchaSolution:
+    async def solve_perimeterx_async(self, site_url: str, data_blob: Optional[str] = None,
+                                     user_agent: Optional[str] = None,
+                                     cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """
         Solve PerimeterX "Press and Hold" challenge using CapSolver.
 
@@ -388,12 +743,9 @@ class CapSolver(CaptchaSolverBase):
         Returns:
             CaptchaSolution with token
         """
-        logger.info(f"Solving PerimeterX challenge for {site_url}")
+        logger.info("Solving PerimeterX challenge for %s", site_url)
 
-        task = {
-            "type": "AntiPerimeterXTask",
-            "websiteURL": site_url,
-        }
+        task = {**self._PERIMETERX_BASE, "websiteURL": site_url}
 
         if data_blob:
             task["captchaScript"] = data_blob
@@ -401,65 +753,61 @@ class CapSolver(CaptchaSolverBase):
         if user_agent:
             task["userAgent"] = user_agent
 
-        task_id = self._create_task(task)
+        task_id = await self._create_task(task)
         if not task_id:
             return CaptchaSolution(success=False, error="Failed to create task")
 
-        return self._get_result(task_id)
+        return await self._get_result(task_id, cancel_event=cancel_event)
 
-    def solve_recaptcha_v2(self, site_url: str, site_key: str,
-                           invisible: bool = False) -> CaptchaSolution:
+    async def solve_recaptcha_v2_async(self, site_url: str, site_key: str,
+                                       invisible: bool = False,
+                                       cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """Solve reCAPTCHA v2."""
-        logger.info(f"Solving reCAPTCHA v2 for {site_url}")
-
-        task_type = "ReCaptchaV2TaskProxyLess"
-        if invisible:
-            task_type = "ReCaptchaV2TaskProxyLess"  # Same type, different handling
+        logger.info("Solving reCAPTCHA v2 for %s", site_url)
 
+        # Invisible reCAPTCHA uses the same task type, flagged by isInvisible
         task = {
-            "type": task_type,
+            **self._RECAPTCHA_V2_BASE,
             "websiteURL": site_url,
             "websiteKey": site_key,
             "isInvisible": invisible
         }
 
-        task_id = self._create_task(task)
+        task_id = await self._create_task(task)
         if not task_id:
             return CaptchaSolution(success=False, error="Failed to create task")
 
-        return self._get_result(task_id)
+        return await self._get_result(task_id, cancel_event=cancel_event)
 
-    def solve_hcaptcha(self, site_url: str, site_key: str) -> CaptchaSolution:
+    async def solve_hcaptcha_async(self, site_url: str, site_key: str,
+                                   cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """Solve hCaptcha."""
-        logger.info(f"Solving hCaptcha for {site_url}")
+        logger.info("Solving hCaptcha for %s", site_url)
 
-        task = {
-            "type": "HCaptchaTaskProxyLess",
-            "websiteURL": site_url,
-            "websiteKey": site_key
-        }
+        task = {**self._HCAPTCHA_BASE, "websiteURL": site_url, "websiteKey": site_key}
 
-        task_id = self._create_task(task)
+        task_id = await self._create_task(task)
         if not task_id:
             return CaptchaSolution(success=False, error="Failed to create task")
 
-        return self._get_result(task_id)
+        return await self._get_result(task_id, cancel_event=cancel_event)
 
     def get_balance(self) -> float:
         """Get account balance in USD."""
         try:
             response = self.session.post(
-                f"{self.BASE_URL}/getBalance",
-                json={"clientKey": self.api_key},
+                self._BALANCE_URL,
+                content=_json_dumps({"clientKey": self.api_key}),
+                headers=JSON_HEADERS,
                 timeout=30
             )
-            result = response.json()
+            result = _json_loads(response.content)
 
             if result.get("errorId") == 0:
                 return float(result.get("balance", 0))
 
         except Exception as e:
-            logger.error(f"Failed to get CapSolver balance: {e}")
+            logger.error("Failed to get CapSolver balance: %s", e)
 
         return 0.0
 
@@ -511,6 +859,10 @@ class CaptchaSolverManager:
     Manages multiple solver providers and handles automatic fallback.
     """
 
+    CACHE_MAX_ENTRIES = 256
+    DISK_CACHE_SIZE_LIMIT = 64 << 20  # bytes
+    DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "captcha"
+
     def __init__(self, config: Dict):
         """
         Initialize with configuration.
@@ -525,14 +877,53 @@ class CaptchaSolverManager:
                 "2captcha": {"api_key": "..."}
             },
             "timeout": 120,
-            "max_retries": 2
+            "max_retries": 2,
+            "hedge": false,
+            "cache_ttl": 60,
+            "persistent_cache": false,
+            "cache_dir": ".cache/captcha",
+            "breaker_threshold": 3,
+            "breaker_cooldown": 300
         }
+
+        With "hedge" enabled, all providers are raced on every attempt and the
+        first success wins. This cuts latency when a provider stalls, at the
+        cost of paying for more than one solve per attempt.
+
+        Successful PerimeterX solutions are reused for "cache_ttl" seconds
+        for the same host and data blob (0 disables the cache). With
+        "persistent_cache" they are also written to a diskcache store in
+        "cache_dir", so a restarted scraper doesn't pay for them again.
+
+        A provider that fails "breaker_threshold" solves in a row is skipped
+        for "breaker_cooldown" seconds, so an outage goes straight to the
+        fallback instead of burning retries (0 disables the breaker).
         """
         self.enabled = config.get("enabled", False)
         self.primary_provider = config.get("primary_provider", "capsolver")
         self.fallback_provider = config.get("fallback_provider")
         self.timeout = config.get("timeout", 120)
         self.max_retries = config.get("max_retries", 2)
+        self.hedge = config.get("hedge", False)
+
+        # Circuit breaker: provider -> {"fail_count", "open_until"}
+        self.breaker_threshold = config.get("breaker_threshold", 3)
+        self.breaker_cooldown = config.get("breaker_cooldown", 300)
+        self._breaker: Dict[str, Dict[str, float]] = {}
+
+        # (netloc, blob digest) -> (solution, solved_at), in LRU order
+        self.cache_ttl = config.get("cache_ttl", 60)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[CaptchaSolution, float]]" = OrderedDict()
+        self._disk_cache = None
+
+        if config.get("persistent_cache", False) and self.cache_ttl > 0:
+            if DISKCACHE_AVAILABLE:
+                self._disk_cache = diskcache.Cache(
+                    str(config.get("cache_dir", self.DEFAULT_CACHE_DIR)),
+                    size_limit=self.DISK_CACHE_SIZE_LIMIT
+                )
+            else:
+                logger.warning("persistent_cache requires diskcache (pip install diskcache); using memory cache only")
 
         self.solvers: Dict[str, CaptchaSolverBase] = {}
 
@@ -550,16 +941,38 @@ class CaptchaSolverManager:
                         api_key,
                         timeout=self.timeout
                     )
-                    logger.info(f"Initialized CAPTCHA solver: {provider_name}")
+                    self._breaker[provider_name] = {"fail_count": 0, "open_until": 0.0}
+                    logger.info("Initialized CAPTCHA solver: %s", provider_name)
                 except ValueError as e:
-                    logger.warning(f"Failed to initialize {provider_name}: {e}")
+                    logger.warning("Failed to initialize %s: %s", provider_name, e)
 
     def is_available(self) -> bool:
         """Check if any solver is available."""
         return self.enabled and len(self.solvers) > 0
 
-    def solve_perimeterx(self, site_url: str, data_blob: Optional[str] = None,
-                         user_agent: Optional[str] = None) -> CaptchaSolution:
+    def _breaker_open(self, provider_name: str) -> bool:
+        """Check whether a provider is in its failure cool-down."""
+        return time.monotonic() < self._breaker[provider_name]["open_until"]
+
+    def _record_outcome(self, provider_name: str, success: bool):
+        """Update a provider's circuit breaker after a solve."""
+        state = self._breaker[provider_name]
+        if success:
+            state["fail_count"] = 0
+            return
+
+        state["fail_count"] += 1
+        if self.breaker_threshold > 0 and state["fail_count"] >= self.breaker_threshold:
+            state["open_until"] = time.monotonic() + self.breaker_cooldown
+            state["fail_count"] = 0
+            logger.warning(
+                "%s failed %s times in a row, skipping it for %ss",
+                provider_name, self.breaker_threshold, self.breaker_cooldown
+            )
+
+    async def solve_perimeterx_async(self, site_url: str, data_blob: Optional[str] = None,
+                                     user_agent: Optional[str] = None,
+                                     cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
         """
         Solve PerimeterX challenge with automatic fallback.
 
@@ -567,6 +980,7 @@ class CaptchaSolverManager:
             site_url: URL where challenge appeared
             data_blob: PerimeterX data blob
             user_agent: Browser user agent
+            cancel_event: Set it to abandon the solve (e.g. the page was closed)
 
         Returns:
             CaptchaSolution
@@ -577,46 +991,241 @@ class CaptchaSolverManager:
                 error="CAPTCHA solving is not configured or enabled"
             )
 
+        cache_key = self._cache_key(site_url, data_blob)
+        cached = self._get_cached(cache_key)
+        if cached:
+            logger.info("Reusing cached PerimeterX solution for %s", cache_key[0])
+            return cached
+
+        result = await self._solve_perimeterx(site_url, data_blob, user_agent, cancel_event)
+        if result.success and self.cache_ttl > 0:
+            self._store_cached(cache_key, result)
+        return result
+
+    async def solve_perimeterx_batch(self, jobs: List[PerimeterXJob]) -> List[CaptchaSolution]:
+        """
+        Solve several PerimeterX challenges concurrently with fallback.
+
+        Jobs that share a host and data blob are solved once.
+
+        Args:
+            jobs: (site_url, data_blob, user_agent) tuples
+
+        Returns:
+            One CaptchaSolution per job, in the same order
+        """
+        unique: Dict[Tuple[str, str], PerimeterXJob] = {}
+        for job in jobs:
+            unique.setdefault(self._cache_key(job[0], job[1]), job)
+
+        results = await asyncio.gather(*(self.solve_perimeterx_async(*job) for job in unique.values()))
+        by_key = dict(zip(unique, results))
+        return [by_key[self._cache_key(site_url, data_blob)] for site_url, data_blob, _ in jobs]
+
+    @staticmethod
+    def _cache_key(site_url: str, data_blob: Optional[str]) -> Tuple[str, str]:
+        """Build the solution cache key for a challenge."""
+        digest = hashlib.blake2b((data_blob or "").encode(), digest_size=16).hexdigest()
+        return urlparse(site_url).netloc, digest
+
+    def _get_cached(self, cache_key: Tuple[str, str]) -> Optional[CaptchaSolution]:
+        """Return a cached solution that is still within its TTL."""
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return self._get_disk_cached(cache_key)
+
+        solution, solved_at = entry
+        if time.monotonic() - solved_at >= self.cache_ttl:
+            del self._cache[cache_key]
+            return None
+
+        self._cache.move_to_end(cache_key)
+        return solution
+
+    def _get_disk_cached(self, cache_key: Tuple[str, str]) -> Optional[CaptchaSolution]:
+        """Look up a solution persisted by an earlier run."""
+        if self._disk_cache is None:
+            return None
+
+        try:
+            entry = self._disk_cache.get(cache_key)
+        except Exception as e:
+            logger.warning("CAPTCHA disk cache read failed: %s", e)
+            return None
+        if entry is None:
+            return None
+
+        fields, solved_at_wall = entry
+        solution = CaptchaSolution(**fields)
+
+        # Promote to the memory cache, keeping the original solve time
+        age = max(0.0, time.time() - solved_at_wall)
+        self._remember(cache_key, solution, time.monotonic() - age)
+        return solution
+
+    def _store_cached(self, cache_key: Tuple[str, str], solution: CaptchaSolution):
+        """Cache a successful solution in memory and, if enabled, on disk."""
+        self._remember(cache_key, solution, time.monotonic())
+
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(cache_key, (asdict(solution), time.time()), expire=self.cache_ttl)
+            except Exception as e:
+                logger.warning("CAPTCHA disk cache write failed: %s", e)
+
+    def _remember(self, cache_key: Tuple[str, str], solution: CaptchaSolution, solved_at: float):
+        """Insert into the in-memory LRU cache."""
+        self._cache[cache_key] = (solution, solved_at)
+        self._cache.move_to_end(cache_key)
+        if len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    async def _solve_perimeterx(self, site_url: str, data_blob: Optional[str],
+                                user_agent: Optional[str],
+                                cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Solve with the configured providers, without consulting the cache."""
         # Try primary provider first
         providers_to_try = [self.primary_provider]
         if self.fallback_provider and self.fallback_provider != self.primary_provider:
             providers_to_try.append(self.fallback_provider)
 
-        last_error = None
+        solvers = {
+            name: self.solvers[name]
+            for name in providers_to_try
+            if name in self.solvers
+        }
 
-        for provider_name in providers_to_try:
-            solver = self.solvers.get(provider_name)
-            if not solver:
-                continue
+        if self.hedge and len(solvers) > 1:
+            return await self._solve_perimeterx_hedged(solvers, site_url, data_blob, user_agent, cancel_event)
+
+        last_error = None
 
+        for provider_name, solver in solvers.items():
             for attempt in range(self.max_retries):
-                logger.info(f"Attempting PerimeterX solve with {provider_name} (attempt {attempt + 1})")
+                if cancel_event is not None and cancel_event.is_set():
+                    return CaptchaSolution(success=False, error="Cancelled")
+
+                if self._breaker_open(provider_name):
+                    logger.info("Skipping %s: circuit open", provider_name)
+                    last_error = last_error or f"{provider_name} circuit open"
+                    break
+
+                logger.info("Attempting PerimeterX solve with %s (attempt %d)", provider_name, attempt + 1)
 
                 try:
-                    result = solver.solve_perimeterx(site_url, data_blob, user_agent)
+                    result = await solver.solve_perimeterx_async(site_url, data_blob, user_agent, cancel_event)
 
                     if result.success:
+                        self._record_outcome(provider_name, True)
                         return result
 
                     last_error = result.error
-                    logger.warning(f"{provider_name} failed: {result.error}")
+                    logger.warning("%s failed: %s", provider_name, result.error)
 
                 except Exception as e:
                     last_error = str(e)
-                    logger.error(f"{provider_name} error: {e}")
+                    logger.error("%s error: %s", provider_name, e)
+
+                if not (cancel_event is not None and cancel_event.is_set()):
+                    self._record_outcome(provider_name, False)
+
+        return CaptchaSolution(
+            success=False,
+            error=f"All CAPTCHA solvers failed. Last error: {last_error}"
+        )
+
+    async def _solve_perimeterx_hedged(self, solvers: Dict[str, CaptchaSolverBase],
+                                       site_url: str, data_blob: Optional[str],
+                                       user_agent: Optional[str],
+                                       cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Race all providers on each attempt and return the first success."""
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            if cancel_event is not None and cancel_event.is_set():
+                return CaptchaSolution(success=False, error="Cancelled")
+
+            active = {name: solver for name, solver in solvers.items() if not self._breaker_open(name)}
+            if not active:
+                last_error = last_error or "all provider circuits open"
+                break
+
+            logger.info("Attempting hedged PerimeterX solve with %s (attempt %d)", ', '.join(active), attempt + 1)
+
+            tasks = {
+                asyncio.create_task(solver.solve_perimeterx_async(site_url, data_blob, user_agent, cancel_event)): name
+                for name, solver in active.items()
+            }
+            pending = set(tasks)
+
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                    for task in done:
+                        provider_name = tasks[task]
+                        try:
+                            result = task.result()
+                        except Exception as e:
+                            last_error = str(e)
+                            logger.error("%s error: %s", provider_name, e)
+                            self._record_outcome(provider_name, False)
+                            continue
+
+                        if result.success:
+                            logger.info("%s won the hedged solve", provider_name)
+                            self._record_outcome(provider_name, True)
+                            return result
+
+                        last_error = result.error
+                        logger.warning("%s failed: %s", provider_name, result.error)
+                        if not (cancel_event is not None and cancel_event.is_set()):
+                            self._record_outcome(provider_name, False)
+            finally:
+                # Stop polling the slower provider(s)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
 
         return CaptchaSolution(
             success=False,
             error=f"All CAPTCHA solvers failed. Last error: {last_error}"
         )
 
+    def solve_perimeterx(self, site_url: str, data_blob: Optional[str] = None,
+                         user_agent: Optional[str] = None,
+                         cancel_event: Optional[CancelEvent] = None) -> CaptchaSolution:
+        """Solve PerimeterX challenge with automatic fallback (blocking)."""
+        return _run_sync(self.solve_perimeterx_async(site_url, data_blob, user_agent, cancel_event), self.aclose)
+
+    async def aclose(self):
+        """Stop solver background work and close the async HTTP client."""
+        for solver in self.solvers.values():
+            await solver.aclose()
+
+    def close(self):
+        """Close the shared HTTP client and the disk cache."""
+        _close_shared_client()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+
     def get_balances(self) -> Dict[str, float]:
         """Get balance from all configured providers."""
         balances = {}
-        for name, solver in self.solvers.items():
-            try:
-                balances[name] = solver.get_balance()
-            except Exception as e:
-                logger.error(f"Failed to get balance for {name}: {e}")
-                balances[name] = -1.0
+        if not self.solvers:
+            return balances
+
+        # Balance checks are pure I/O, so query every provider at once
+        with ThreadPoolExecutor(max_workers=len(self.solvers)) as executor:
+            futures = {
+                executor.submit(solver.get_balance): name
+                for name, solver in self.solvers.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    balances[name] = future.result()
+                except Exception as e:
+                    logger.error("Failed to get balance for %s: %s", name, e)
+                    balances[name] = -1.0
         return balances
@@ -5,38 +5,227 @@ Supports sitemap index files, gzip compression, and incremental updates via last
 """
 
 import gzip
+import io
+import json
 import logging
+import os
 import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
 from dataclasses import dataclass
-from datetime import datetime
-from io import BytesIO
-from typing import Generator, List, Optional, Set
-from xml.etree import ElementTree as ET
-
-import requests
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, Generator, Iterator, List, Optional, Set, Tuple, Union
+
+import httpx
+import numpy as np
+from lxml import etree
+
+# Optional: HTTP/2 multiplexes nested sitemap fetches over one connection
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Optional: Aho-Corasick matches product and disallowed patterns in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
-# XML namespaces used in sitemaps
-SITEMAP_NS = {
-    'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-    'xhtml': 'http://www.w3.org/1999/xhtml'
+# iterparse only materializes these; '{*}' also matches un-namespaced sitemaps
+SITEMAP_ITEM_TAGS = ('{*}url', '{*}sitemap')
+
+_SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Clark tag -> local name, precomputed for the sitemap schema (namespaced and
+# bare) so the hot loop does a dict hit instead of splitting each tag string.
+# Other tags (image:image, xhtml:link, ...) are added on first sight.
+_LOCAL_NAMES: Dict[str, str] = {
+    tag: name
+    for name in ('url', 'sitemap', 'loc', 'lastmod', 'changefreq', 'priority')
+    for tag in (f'{{{_SITEMAP_NS}}}{name}', name)
 }
+_LOCAL_NAMES_MAX = 1024  # don't let odd documents grow the table without bound
+
+
+def _local_name(tag: str) -> str:
+    """Local part of a Clark-notation tag, memoized in _LOCAL_NAMES."""
+    name = _LOCAL_NAMES.get(tag)
+    if name is None:
+        name = tag.rsplit('}', 1)[-1]
+        if len(_LOCAL_NAMES) < _LOCAL_NAMES_MAX:
+            _LOCAL_NAMES[tag] = name
+    return name
+
+# Compiled once; local-name() matches namespaced and bare sitemaps alike
+_LOC_XPATH = etree.XPath("string(*[local-name()='loc'])")
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# robots.txt is tiny: a host that can't connect in 5s or answer in 10s is skipped
+ROBOTS_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+# "Sitemap: <url>" lines in robots.txt (directive names are case-insensitive)
+_ROBOTS_SITEMAP_RE = re.compile(r'^[ \t]*sitemap[ \t]*:[ \t]*(\S+)', re.IGNORECASE | re.MULTILINE)
+# Any "<field>: <value>" line, with trailing comments dropped
+_ROBOTS_LINE_RE = re.compile(r'^[ \t]*([A-Za-z-]+)[ \t]*:[ \t]*([^#\r\n]*)', re.MULTILINE)
+_ROBOTS_DELAY_RE = re.compile(r'\d+(?:\.\d+)?')
 
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
 
-@dataclass
+
+def _to_epoch(value: datetime) -> int:
+    """UTC epoch seconds for a datetime (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+@lru_cache(maxsize=4096)
+def _parse_lastmod(date_str: Optional[str]) -> Optional[int]:
+    """
+    Parse a W3C/ISO 8601 lastmod value into UTC epoch seconds.
+
+    Cached: entries in one sitemap tend to share a handful of lastmod values
+    (often a bare date), so most calls skip parsing entirely.
+    """
+    if not date_str:
+        return None
+
+    value = date_str.strip()
+    # fromisoformat() only accepts a trailing 'Z' from Python 3.11
+    if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+
+    try:
+        return _to_epoch(datetime.fromisoformat(value))
+    except ValueError:
+        pass
+
+    # Fall back to the date part (e.g. 7-digit fractions, odd offsets)
+    try:
+        return _to_epoch(datetime.fromisoformat(value[:10]))
+    except ValueError:
+        return None
+
+
+# changefreq has a closed vocabulary; share one string object per value
+CHANGEFREQ_VALUES = ('always', 'hourly', 'daily', 'weekly', 'monthly', 'yearly', 'never')
+_CHANGEFREQ = {v: v for v in map(sys.intern, CHANGEFREQ_VALUES)}
+# Column codes for parse_sitemap_batched (-1 = missing/unknown)
+_CHANGEFREQ_IDS = {v: i for i, v in enumerate(CHANGEFREQ_VALUES)}
+
+DEFAULT_BATCH_SIZE = 65536
+
+# (loc, lastmod, changefreq, priority) -> whatever the walk yields per URL
+EntryFactory = Callable[[str, Optional[int], Optional[str], Optional[float]], Any]
+
+# Walmart product (item) pages: /en/ip/... and /fr/produit/...
+# Bound .search methods are C callables, so they pass straight through as url_filter
+_PRODUCT_SEARCH = re.compile(r'/(?:ip|produit)/').search
+
+# Disallowed patterns from robots.txt, matched in a single pass
+WALMART_DISALLOWED_PATTERNS = [
+    '/search',
+    '/recherche',
+    '/cart',
+    '/panier',
+    '/sign-in',
+    '/account',
+    '/kiosk/',
+    '+',  # Faceted navigation
+    '?f=',  # Filter params
+]
+_DISALLOWED_SEARCH = re.compile('|'.join(re.escape(p) for p in WALMART_DISALLOWED_PATTERNS)).search
+
+if AHOCORASICK_AVAILABLE:
+    # Value tells accept (product) from reject (disallowed) hits
+    _WALMART_AUTOMATON = ahocorasick.Automaton()
+    for _pattern in WALMART_DISALLOWED_PATTERNS:
+        _WALMART_AUTOMATON.add_word(_pattern, False)
+    for _pattern in ('/ip/', '/produit/'):
+        _WALMART_AUTOMATON.add_word(_pattern, True)
+    _WALMART_AUTOMATON.make_automaton()
+    del _pattern
+
+
+@dataclass(slots=True)
 class SitemapEntry:
-    """Represents a single URL entry from a sitemap."""
+    """
+    Represents a single URL entry from a sitemap.
+
+    lastmod is stored as UTC epoch seconds rather than a datetime.
+    """
     loc: str
-    lastmod: Optional[datetime] = None
+    lastmod: Optional[int] = None
+    changefreq: Optional[str] = None
+    priority: Optional[float] = None
+
+    @property
+    def is_product_page(self) -> bool:
+        """Check if URL appears to be a product page (Walmart format: /en/ip/...)."""
+        return _PRODUCT_SEARCH(self.loc) is not None
+
+
+@dataclass(slots=True)
+class CompactSitemapEntry:
+    """
+    Sitemap entry that shares its URL prefix with every other entry.
+
+    Produced instead of SitemapEntry only when SitemapParser is given a
+    host_prefix and the URL starts with it: `path` holds the rest of the URL
+    and `loc` rebuilds the full URL on access.
+    """
+    path: str
+    lastmod: Optional[int] = None
     changefreq: Optional[str] = None
     priority: Optional[float] = None
+    host_prefix: str = ''
+
+    @property
+    def loc(self) -> str:
+        """Full URL of the entry."""
+        return self.host_prefix + self.path
 
     @property
     def is_product_page(self) -> bool:
         """Check if URL appears to be a product page (Walmart format: /en/ip/...)."""
-        return '/ip/' in self.loc or '/produit/' in self.loc
+        return _PRODUCT_SEARCH(self.loc) is not None
+
+
+class _ByteIteratorStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks (for iterparse)."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
 
 
 class SitemapParser:
@@ -46,17 +235,39 @@ class SitemapParser:
     - Gzip compression
     - Incremental updates via lastmod filtering
     - robots.txt sitemap discovery
+    - Concurrent download of nested sitemaps
+    - Conditional re-fetching (ETag/Last-Modified) across runs via state_path
     """
 
-    def __init__(self, session: Optional[requests.Session] = None, user_agent: Optional[str] = None):
+    DEFAULT_MAX_WORKERS = 8
+    # Prefetched sitemaps are spooled: bodies larger than this go to a temp file
+    SPOOL_MAX_MEMORY = 1 << 20  # bytes
+
+    def __init__(self, session: Optional[httpx.Client] = None, user_agent: Optional[str] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, crawl_delay: Optional[float] = None,
+                 host_prefix: Optional[str] = None, state_path: Optional[Path] = None):
         """
         Initialize sitemap parser.
 
         Args:
-            session: Optional requests session (creates new if not provided)
+            session: Optional httpx client (creates new if not provided)
             user_agent: User agent string for requests
+            max_workers: Nested sitemaps downloaded in parallel
+            crawl_delay: Minimum seconds between sitemap requests (taken from
+                robots.txt Crawl-delay by discover_sitemaps when not set)
+            host_prefix: Common URL prefix (e.g. https://www.walmart.ca/en/ip/)
+                stored once instead of on every entry. Matching URLs are
+                yielded as CompactSitemapEntry; others stay SitemapEntry.
+            state_path: JSON file remembering each sitemap's validators and
+                nested sitemaps between runs. When set, sitemaps the server
+                reports unchanged (304) are not re-parsed, so only new or
+                modified sitemaps yield entries.
         """
-        self.session = session or requests.Session()
+        self.session = session or httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            timeout=60.0,
+            follow_redirects=True
+        )
         if user_agent:
             self.session.headers['User-Agent'] = user_agent
         else:
@@ -65,6 +276,99 @@ class SitemapParser:
                 '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             )
 
+        self.max_workers = max(1, max_workers)
+        self.host_prefix = sys.intern(host_prefix) if host_prefix else None
+        self.crawl_delay = crawl_delay
+        self._crawl_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+        # Conditional-request state: url -> {etag, last_modified, sitemaps}
+        self.state_path = Path(state_path) if state_path else None
+        self._state: Dict[str, Dict[str, Any]] = self._load_state()
+        self._fetched_validators: Dict[str, Dict[str, str]] = {}
+        self._state_lock = threading.Lock()
+
+    def close(self):
+        """Save conditional-request state and close the HTTP client."""
+        self.save_state()
+        self.session.close()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        """Load saved sitemap validators from state_path."""
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sitemap state {self.state_path}: {e}")
+            return {}
+
+    def save_state(self):
+        """Write sitemap validators to state_path (atomically)."""
+        if not self.state_path:
+            return
+        with self._state_lock:
+            data = json.dumps(self._state)
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(self.state_path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Failed to save sitemap state {self.state_path}: {e}")
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match/If-Modified-Since headers from the last run, if any."""
+        if not self.state_path:
+            return {}
+        with self._state_lock:
+            saved = self._state.get(url)
+        if not saved:
+            return {}
+
+        headers = {}
+        if saved.get('etag'):
+            headers['If-None-Match'] = saved['etag']
+        if saved.get('last_modified'):
+            headers['If-Modified-Since'] = saved['last_modified']
+        return headers
+
+    def _check_not_modified(self, url: str, response: httpx.Response) -> bool:
+        """
+        Handle a sitemap response's validators.
+
+        Returns:
+            True if the server answered 304 Not Modified
+        """
+        if response.status_code == 304:
+            return True
+        if self.state_path:
+            validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+            with self._state_lock:
+                self._fetched_validators[url] = validators
+        return False
+
+    def _record_parsed(self, url: str, nested_sitemaps: List[str]):
+        """Remember a fully parsed sitemap's validators and nested sitemaps."""
+        if not self.state_path:
+            return
+        with self._state_lock:
+            validators = self._fetched_validators.pop(url, None)
+            if validators and (validators['etag'] or validators['last_modified']):
+                self._state[url] = {**validators, 'sitemaps': nested_sitemaps}
+            else:
+                self._state.pop(url, None)
+
+    def _saved_nested_sitemaps(self, url: str) -> List[str]:
+        """Nested sitemaps recorded for an unchanged sitemap."""
+        with self._state_lock:
+            return list(self._state.get(url, {}).get('sitemaps', []))
+
     def fetch_robots_txt(self, base_url: str) -> str:
         """
         Fetch robots.txt content from a URL.
@@ -73,12 +377,21 @@ class SitemapParser:
             base_url: Base URL of the site (e.g., https://www.walmart.ca)
 
         Returns:
-            robots.txt content as string
+            robots.txt content as string (empty if missing or the host is slow)
         """
         robots_url = f"{base_url.rstrip('/')}/robots.txt"
-        logger.info(f"Fetching robots.txt from {robots_url}")
+        logger.debug(f"Fetching robots.txt from {robots_url}")
 
-        response = self.session.get(robots_url, timeout=30)
+        try:
+            response = self.session.get(robots_url, timeout=ROBOTS_TIMEOUT)
+        except httpx.TimeoutException:
+            logger.debug(f"Timed out fetching {robots_url}")
+            return ''
+
+        # No robots.txt means no sitemap hints, not an error
+        if response.status_code == 404:
+            logger.debug(f"No robots.txt at {robots_url}")
+            return ''
         response.raise_for_status()
         return response.text
 
@@ -92,16 +405,36 @@ class SitemapParser:
         Returns:
             List of sitemap URLs
         """
-        sitemaps = []
-        for line in robots_content.split('\n'):
-            line = line.strip()
-            if line.lower().startswith('sitemap:'):
-                sitemap_url = line.split(':', 1)[1].strip()
-                sitemaps.append(sitemap_url)
+        sitemaps = _ROBOTS_SITEMAP_RE.findall(robots_content)
 
         logger.info(f"Found {len(sitemaps)} sitemaps in robots.txt")
         return sitemaps
 
+    def extract_crawl_delay(self, robots_content: str,
+                            user_agent: Optional[str] = None) -> Optional[float]:
+        """
+        Extract the Crawl-delay that applies to this crawler from robots.txt.
+
+        Only the group naming this crawler's product token (the part of the
+        User-Agent before the first '/') is honoured, falling back to the
+        '*' group; delays aimed at other bots are ignored.
+
+        Args:
+            robots_content: robots.txt file content
+            user_agent: User agent to match (defaults to the session's)
+
+        Returns:
+            Delay in seconds, or None if no matching group sets one
+        """
+        delays = _robots_crawl_delays(robots_content)
+        if not delays:
+            return None
+
+        user_agent = user_agent or self.session.headers.get('User-Agent', '')
+        token = user_agent.split('/', 1)[0].strip().lower()
+        delay = delays.get(token) if token else None
+        return delay if delay is not None else delays.get('*')
+
     def discover_sitemaps(self, base_url: str) -> List[str]:
         """
         Discover sitemap URLs from robots.txt.
@@ -114,201 +447,459 @@ class SitemapParser:
         """
         try:
             robots_content = self.fetch_robots_txt(base_url)
+            if self.crawl_delay is None:
+                self.crawl_delay = self.extract_crawl_delay(robots_content)
+                if self.crawl_delay:
+                    logger.info(f"Honoring robots.txt Crawl-delay of {self.crawl_delay}s")
             return self.extract_sitemaps_from_robots(robots_content)
         except Exception as e:
             logger.warning(f"Failed to discover sitemaps from robots.txt: {e}")
             return []
 
-    def _fetch_sitemap_content(self, url: str) -> bytes:
+    def _respect_crawl_delay(self):
+        """Block until the next request is allowed under crawl_delay (thread-safe)."""
+        if not self.crawl_delay:
+            return
+
+        with self._crawl_lock:
+            delay = self._next_request_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_request_at = time.monotonic() + self.crawl_delay
+
+    def _open_sitemap_stream(self, url: str) -> Optional[httpx.Response]:
         """
-        Fetch sitemap content, handling gzip compression.
+        Open a streaming response for a sitemap without buffering the body.
 
         Args:
             url: Sitemap URL
 
         Returns:
-            Raw XML bytes
+            Response whose iter_bytes() yields decoded XML (or gzip payload for
+            .gz URLs), or None if the sitemap is unchanged since the last run
         """
+        self._respect_crawl_delay()
         logger.debug(f"Fetching sitemap: {url}")
-        response = self.session.get(url, timeout=60)
-        response.raise_for_status()
+        request = self.session.build_request(
+            'GET', url, headers=self._conditional_headers(url), timeout=60
+        )
+        response = self.session.send(request, stream=True)
+        try:
+            if self._check_not_modified(url, response):
+                response.close()
+                return None
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            response.close()
+            raise
+        return response
+
+    @contextmanager
+    def _open_sitemap(self, url: str) -> Iterator[BinaryIO]:
+        """
+        Open a sitemap as a stream of XML bytes, decompressing gzip on the fly.
 
-        content = response.content
+        Compression is detected from the gzip magic bytes rather than the
+        .gz suffix, since servers often undo it in transit (Content-Encoding)
+        or serve gzip under a plain .xml name.
 
-        # Handle gzip compression (common for large sitemaps)
-        if url.endswith('.gz') or response.headers.get('Content-Encoding') == 'gzip':
-            try:
-                content = gzip.decompress(content)
-            except Exception:
-                # Already decompressed or not gzipped
-                pass
+        Nothing is buffered: iterparse pulls from the gzip reader, which pulls
+        from the socket. The response is closed when the block exits, even if
+        the consumer stops early.
 
-        return content
+        Args:
+            url: Sitemap URL
 
-    def _parse_datetime(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse ISO 8601 datetime string."""
-        if not date_str:
-            return None
+        Yields:
+            File-like object with raw XML bytes, or None if the sitemap is
+            unchanged since the last run
+        """
+        response = self._open_sitemap_stream(url)
+        if response is None:
+            yield None
+            return
+        try:
+            # iter_bytes() undoes transport-level Content-Encoding as it streams
+            source = io.BufferedReader(_ByteIteratorStream(response.iter_bytes()))
 
-        # Common formats in sitemaps
-        formats = [
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%dT%H:%M:%S.%f%z',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d',
-        ]
+            # Handle gzip compression (common for large sitemaps)
+            if source.peek(2)[:2] == GZIP_MAGIC:
+                source = gzip.GzipFile(fileobj=source)
+            yield source
+        finally:
+            response.close()
 
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str.replace('+00:00', 'Z').replace('Z', '+0000'), fmt)
-            except ValueError:
-                continue
+    def _fetch_sitemap_content(self, url: str) -> Optional[BinaryIO]:
+        """
+        Download a sitemap into a spool file (runs on the prefetch thread pool).
 
-        # Try basic date parse
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except ValueError:
-            return None
+        The body is streamed to a SpooledTemporaryFile, so only the first
+        SPOOL_MAX_MEMORY bytes of each download stay in memory; the rest of a
+        large child sitemap goes to disk until it is parsed.
+
+        Args:
+            url: Sitemap URL
 
-    def _parse_sitemap_xml(self, content: bytes) -> tuple[List[str], List[SitemapEntry]]:
+        Returns:
+            Spool file rewound to the start, holding XML bytes or the
+            still-compressed payload for gzip sitemaps; None if the sitemap is
+            unchanged since the last run. The caller closes it.
+        """
+        self._respect_crawl_delay()
+        logger.debug(f"Prefetching sitemap: {url}")
+        with self.session.stream('GET', url, headers=self._conditional_headers(url), timeout=60) as response:
+            if self._check_not_modified(url, response):
+                return None
+            response.raise_for_status()
+
+            spool = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_MEMORY)
+            try:
+                # iter_bytes() undoes transport-level Content-Encoding
+                for chunk in response.iter_bytes():
+                    spool.write(chunk)
+            except BaseException:
+                spool.close()
+                raise
+
+        spool.seek(0)
+        return spool
+
+    @contextmanager
+    def _open_sitemap_content(self, spool: Optional[BinaryIO]) -> Iterator[Optional[BinaryIO]]:
         """
-        Parse sitemap XML content.
+        Open a prefetched sitemap as a stream of XML bytes, closing the spool after.
 
         Args:
-            content: Raw XML bytes
+            spool: File returned by _fetch_sitemap_content
 
-        Returns:
-            Tuple of (sitemap_urls, url_entries)
+        Yields:
+            File-like object with raw XML bytes (None passes through)
         """
-        sitemap_urls = []
-        url_entries = []
+        if spool is None:
+            yield None
+            return
 
         try:
-            root = ET.fromstring(content)
-        except ET.ParseError as e:
-            logger.error(f"Failed to parse sitemap XML: {e}")
-            return sitemap_urls, url_entries
-
-        # Determine root tag (sitemapindex or urlset)
-        root_tag = root.tag.lower()
-
-        # Handle sitemap index (contains references to other sitemaps)
-        if 'sitemapindex' in root_tag:
-            for sitemap in root.findall('.//sm:sitemap', SITEMAP_NS):
-                loc = sitemap.find('sm:loc', SITEMAP_NS)
-                if loc is not None and loc.text:
-                    sitemap_urls.append(loc.text.strip())
-
-            # Also try without namespace (some sitemaps don't use it)
-            if not sitemap_urls:
-                for sitemap in root.findall('.//sitemap'):
-                    loc = sitemap.find('loc')
-                    if loc is not None and loc.text:
-                        sitemap_urls.append(loc.text.strip())
-
-            logger.info(f"Sitemap index contains {len(sitemap_urls)} nested sitemaps")
-
-        # Handle urlset (contains actual URLs)
-        elif 'urlset' in root_tag:
-            for url_elem in root.findall('.//sm:url', SITEMAP_NS):
-                loc = url_elem.find('sm:loc', SITEMAP_NS)
-                if loc is None or not loc.text:
-                    continue
-
-                lastmod_elem = url_elem.find('sm:lastmod', SITEMAP_NS)
-                changefreq_elem = url_elem.find('sm:changefreq', SITEMAP_NS)
-                priority_elem = url_elem.find('sm:priority', SITEMAP_NS)
-
-                entry = SitemapEntry(
-                    loc=loc.text.strip(),
-                    lastmod=self._parse_datetime(lastmod_elem.text if lastmod_elem is not None else None),
-                    changefreq=changefreq_elem.text if changefreq_elem is not None else None,
-                    priority=float(priority_elem.text) if priority_elem is not None else None
-                )
-                url_entries.append(entry)
-
-            # Also try without namespace
-            if not url_entries:
-                for url_elem in root.findall('.//url'):
-                    loc = url_elem.find('loc')
-                    if loc is None or not loc.text:
-                        continue
-
-                    lastmod_elem = url_elem.find('lastmod')
-                    changefreq_elem = url_elem.find('changefreq')
-                    priority_elem = url_elem.find('priority')
-
-                    entry = SitemapEntry(
-                        loc=loc.text.strip(),
-                        lastmod=self._parse_datetime(lastmod_elem.text if lastmod_elem is not None else None),
-                        changefreq=changefreq_elem.text if changefreq_elem is not None else None,
-                        priority=float(priority_elem.text) if priority_elem is not None else None
-                    )
-                    url_entries.append(entry)
+            source = spool
+            if spool.read(2) == GZIP_MAGIC:
+                source = gzip.GzipFile(fileobj=spool, mode='rb')
+            spool.seek(0)
+            yield source
+        finally:
+            spool.close()
+
+    def _make_entry(self, loc: str, lastmod: Optional[int] = None,
+                    changefreq: Optional[str] = None,
+                    priority: Optional[float] = None
+                    ) -> Union[SitemapEntry, CompactSitemapEntry]:
+        """Build an entry, splitting off host_prefix and interning changefreq."""
+        if changefreq:
+            changefreq = changefreq.strip()
+            changefreq = _CHANGEFREQ.get(changefreq) or sys.intern(changefreq)
+
+        prefix = self.host_prefix
+        if prefix and loc.startswith(prefix):
+            return CompactSitemapEntry(loc[len(prefix):], lastmod, changefreq, priority, prefix)
+        return SitemapEntry(loc, lastmod, changefreq, priority)
+
+    def _iter_sitemap_xml(self, source: BinaryIO,
+                          url_filter: Optional[callable] = None,
+                          since: Optional[int] = None,
+                          want_metadata: bool = True,
+                          entry_factory: Optional[EntryFactory] = None) -> Iterator[Union[str, Any]]:
+        """
+        Stream-parse sitemap XML, discarding each element once it is read.
 
-            logger.info(f"Parsed {len(url_entries)} URLs from sitemap")
+        Filters run here, on the raw <loc> text, so rejected URLs never get a
+        SitemapEntry or a lastmod parse.
+
+        Args:
+            source: File-like object with raw XML bytes
+            url_filter: Optional function to filter URLs (a truthy result,
+                e.g. a re.Match, includes the URL)
+            since: Only yield entries modified after this UTC epoch second
+            want_metadata: Parse lastmod/changefreq/priority (lastmod is still
+                parsed when needed for `since`)
+            entry_factory: Builds each yielded URL record (defaults to
+                SitemapEntry via _make_entry)
+
+        Yields:
+            Nested sitemap URLs (str) from sitemap indexes, or entry_factory
+            records (SitemapEntry by default) from urlsets
 
-        return sitemap_urls, url_entries
+        Raises:
+            etree.XMLSyntaxError: If the document is malformed or truncated
+        """
+        make_entry = entry_factory or self._make_entry
+        sitemap_count = 0
+        url_count = 0
+
+        # Sitemaps never need entities, DTDs or network access: turning
+        # them off blocks XXE/billion-laughs payloads and skips the work
+        context = etree.iterparse(
+            source,
+            events=('end',),
+            tag=SITEMAP_ITEM_TAGS,
+            resolve_entities=False,
+            no_network=True,
+            load_dtd=False,
+            huge_tree=False
+        )
+        for _, elem in context:
+            tag = _local_name(elem.tag)
+            if want_metadata or since:
+                # One pass over the children beats several XPath calls
+                fields = {
+                    _local_name(child.tag): child.text
+                    for child in elem
+                    if isinstance(child.tag, str)  # skip comments/PIs
+                }
+            else:
+                fields = None
+
+            loc = fields.get('loc') if fields is not None else _LOC_XPATH(elem)
+            loc = loc.strip() if loc else None
+
+            if loc and tag == 'sitemap':
+                sitemap_count += 1
+                yield loc
+            elif loc and (url_filter is None or url_filter(loc)):
+                lastmod = _parse_lastmod(fields.get('lastmod')) if fields is not None else None
+
+                if not (since and lastmod and lastmod < since):
+                    url_count += 1
+                    if want_metadata:
+                        priority = fields.get('priority')
+                        yield make_entry(
+                            loc,
+                            lastmod,
+                            fields.get('changefreq'),
+                            float(priority) if priority else None
+                        )
+                    else:
+                        yield make_entry(loc, lastmod, None, None)
+
+            # Drop the parsed subtree and already-seen siblings so memory stays flat
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+        if sitemap_count:
+            logger.info(f"Sitemap index contains {sitemap_count} nested sitemaps")
+        if url_count:
+            logger.info(f"Parsed {url_count} matching URLs from sitemap")
 
     def parse_sitemap(self, url: str, recursive: bool = True,
                       since: Optional[datetime] = None,
                       url_filter: Optional[callable] = None,
-                      max_urls: Optional[int] = None) -> Generator[SitemapEntry, None, None]:
+                      max_urls: Optional[int] = None,
+                      want_metadata: bool = True) -> Generator[SitemapEntry, None, None]:
         """
         Parse a sitemap URL and yield entries.
 
+        The root sitemap is streamed; nested sitemaps are downloaded on a
+        thread pool (at most max_workers at a time) and parsed here as each
+        download completes, so entries from different children may interleave
+        in completion order rather than index order.
+
         Args:
             url: Sitemap URL to parse
             recursive: If True, follow nested sitemap references
             since: Only return entries modified after this datetime
-            url_filter: Optional function to filter URLs (returns True to include)
+            url_filter: Optional function to filter URLs (a truthy result,
+                e.g. a re.Match, includes the URL)
             max_urls: Maximum number of URLs to return
+            want_metadata: Populate lastmod/changefreq/priority on entries
 
         Yields:
             SitemapEntry objects
         """
-        urls_yielded = 0
-        visited_sitemaps: Set[str] = set()
-        sitemap_queue = [url]
-
-        while sitemap_queue:
-            current_url = sitemap_queue.pop(0)
-
-            if current_url in visited_sitemaps:
-                continue
-            visited_sitemaps.add(current_url)
+        yield from self._walk_sitemaps(
+            url, recursive, since, url_filter, max_urls, want_metadata, self._make_entry
+        )
+
+    def parse_sitemap_batched(self, url: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                              recursive: bool = True,
+                              since: Optional[datetime] = None,
+                              url_filter: Optional[callable] = None,
+                              max_urls: Optional[int] = None,
+                              want_metadata: bool = True) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Parse a sitemap into columnar batches instead of one object per URL.
 
-            try:
-                content = self._fetch_sitemap_content(current_url)
-                nested_sitemaps, entries = self._parse_sitemap_xml(content)
+        Batches load straight into a DataFrame or pyarrow.Table:
+        - loc: object array of URLs
+        - lastmod: datetime64[s] (UTC, NaT when missing)
+        - changefreq: int8 index into CHANGEFREQ_VALUES (-1 when missing/unknown)
+        - priority: float64 (NaN when missing)
 
-                # Add nested sitemaps to queue if recursive
-                if recursive and nested_sitemaps:
-                    sitemap_queue.extend(nested_sitemaps)
+        Args:
+            url: Sitemap URL to parse
+            batch_size: URLs per batch (the last batch may be shorter)
+            recursive: If True, follow nested sitemap references
+            since: Only return entries modified after this datetime
+            url_filter: Optional function to filter URLs (a truthy result,
+                e.g. a re.Match, includes the URL)
+            max_urls: Maximum number of URLs to return
+            want_metadata: Populate lastmod/changefreq/priority columns
 
-                # Yield URL entries
-                for entry in entries:
-                    # Apply lastmod filter
-                    if since and entry.lastmod and entry.lastmod < since:
-                        continue
+        Yields:
+            Dicts of equal-length column arrays
+        """
+        batch_size = max(1, batch_size)
+        locs: List[str] = []
+        lastmods: List[Optional[int]] = []
+        changefreqs: List[int] = []
+        priorities: List[Optional[float]] = []
+
+        def flush() -> Dict[str, np.ndarray]:
+            batch = {
+                'loc': np.array(locs, dtype=object),
+                'lastmod': np.array(lastmods, dtype='datetime64[s]'),
+                'changefreq': np.array(changefreqs, dtype=np.int8),
+                'priority': np.array(priorities, dtype=np.float64),
+            }
+            locs.clear()
+            lastmods.clear()
+            changefreqs.clear()
+            priorities.clear()
+            return batch
+
+        records = self._walk_sitemaps(
+            url, recursive, since, url_filter, max_urls, want_metadata, _record_tuple
+        )
+        for loc, lastmod, changefreq, priority in records:
+            locs.append(loc)
+            lastmods.append(lastmod)
+            changefreqs.append(_CHANGEFREQ_IDS.get(changefreq.strip(), -1) if changefreq else -1)
+            priorities.append(priority)
+            if len(locs) >= batch_size:
+                yield flush()
+
+        if locs:
+            yield flush()
+
+    def _walk_sitemaps(self, url: str, recursive: bool,
+                       since: Optional[datetime],
+                       url_filter: Optional[callable],
+                       max_urls: Optional[int],
+                       want_metadata: bool,
+                       entry_factory: EntryFactory) -> Iterator[Any]:
+        """Walk a sitemap tree, yielding entry_factory records (see parse_sitemap)."""
+        urls_yielded = 0
+        # Compare lastmod as plain ints; naive datetimes are taken as UTC
+        since_epoch = _to_epoch(since) if since else None
+        # Only this generator touches these; workers just download bytes
+        visited_sitemaps: Set[str] = {url}
+        sitemap_queue: Deque[str] = deque()
+        in_flight: Dict[Future, str] = {}
+        executor: Optional[ThreadPoolExecutor] = None
 
-                    # Apply custom filter
-                    if url_filter and not url_filter(entry.loc):
-                        continue
+        current_url = url
+        future: Optional[Future] = None
 
-                    yield entry
-                    urls_yielded += 1
+        try:
+            while True:
+                try:
+                    if future is None:
+                        opened = self._open_sitemap(current_url)
+                    else:
+                        opened = self._open_sitemap_content(future.result())
+
+                    with opened as source:
+                        if source is None:
+                            # 304: entries were seen last run; only walk its children
+                            logger.info(f"Sitemap unchanged since last run: {current_url}")
+                            items = iter(self._saved_nested_sitemaps(current_url))
+                        else:
+                            items = self._iter_sitemap_xml(
+                                source,
+                                url_filter=url_filter,
+                                since=since_epoch,
+                                want_metadata=want_metadata,
+                                entry_factory=entry_factory
+                            )
+
+                        nested_sitemaps: List[str] = []
+                        for item in items:
+                            # Add nested sitemaps to queue if recursive
+                            if isinstance(item, str):
+                                nested_sitemaps.append(item)
+                                if recursive and item not in visited_sitemaps:
+                                    visited_sitemaps.add(item)
+                                    sitemap_queue.append(item)
+                                continue
+
+                            yield item
+                            urls_yielded += 1
+
+                            if max_urls and urls_yielded >= max_urls:
+                                return
+
+                    # Only a fully read sitemap may be skipped next run
+                    if source is not None:
+                        self._record_parsed(current_url, nested_sitemaps)
+
+                except Exception as e:
+                    logger.error(f"Failed to parse sitemap {current_url}: {e}")
+
+                if sitemap_queue and executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='sitemap-fetch'
+                    )
+                # Bodies are spooled to disk, so in-flight children don't pile up in memory
+                while sitemap_queue and len(in_flight) < self.max_workers:
+                    nested_url = sitemap_queue.popleft()
+                    in_flight[executor.submit(self._fetch_sitemap_content, nested_url)] = nested_url
+
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                current_url = in_flight.pop(future)
+
+        finally:
+            # max_urls reached or consumer stopped: drop queued downloads and
+            # release the spool files of any that finish unread
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            for pending in in_flight:
+                pending.add_done_callback(_close_spool)
+            self.save_state()
+
+    def iter_product_urls(self, sitemap_url: str,
+                          max_urls: Optional[int] = None,
+                          since: Optional[datetime] = None,
+                          url_filter: Optional[callable] = None,
+                          want_metadata: bool = True) -> Generator[SitemapEntry, None, None]:
+        """
+        Stream product page URLs from a sitemap, one entry at a time.
 
-                    if max_urls and urls_yielded >= max_urls:
-                        return
+        Args:
+            sitemap_url: Sitemap URL to parse
+            max_urls: Maximum number of URLs to yield
+            since: Only yield entries modified after this datetime
+            url_filter: Product URL filter (defaults to /ip/ and /produit/ pages)
+            want_metadata: Populate lastmod/changefreq/priority on entries
 
-            except Exception as e:
-                logger.error(f"Failed to parse sitemap {current_url}: {e}")
-                continue
+        Yields:
+            SitemapEntry objects for product pages
+        """
+        yield from self.parse_sitemap(
+            url=sitemap_url,
+            recursive=True,
+            since=since,
+            url_filter=url_filter or _PRODUCT_SEARCH,
+            max_urls=max_urls,
+            want_metadata=want_metadata
+        )
 
     def get_product_urls(self, sitemap_url: str,
                         max_urls: Optional[int] = None,
-                        since: Optional[datetime] = None) -> List[SitemapEntry]:
+                        since: Optional[datetime] = None,
+                        want_metadata: bool = True) -> List[SitemapEntry]:
         """
         Get product page URLs from a sitemap.
 
@@ -316,22 +907,68 @@ class SitemapParser:
             sitemap_url: Sitemap URL to parse
             max_urls: Maximum number of URLs to return
             since: Only return entries modified after this datetime
+            want_metadata: Populate lastmod/changefreq/priority on entries
 
         Returns:
             List of SitemapEntry objects for product pages
         """
-        entries = list(self.parse_sitemap(
-            url=sitemap_url,
-            recursive=True,
+        entries = list(self.iter_product_urls(
+            sitemap_url=sitemap_url,
+            max_urls=max_urls,
             since=since,
-            url_filter=lambda url: '/ip/' in url or '/produit/' in url,
-            max_urls=max_urls
+            want_metadata=want_metadata
         ))
 
         logger.info(f"Found {len(entries)} product URLs")
         return entries
 
 
+def _robots_crawl_delays(robots_content: str) -> Dict[str, float]:
+    """
+    Map each lowercased robots.txt User-agent to its group's Crawl-delay.
+
+    Consecutive User-agent lines share the rules that follow them; a
+    User-agent line after a rule starts a new group. Sitemap lines belong
+    to no group and are skipped. The first delay given for an agent wins.
+    """
+    delays: Dict[str, float] = {}
+    agents: List[str] = []
+    in_rules = False
+
+    for match in _ROBOTS_LINE_RE.finditer(robots_content):
+        field = match.group(1).lower()
+        value = match.group(2).strip()
+
+        if field == 'user-agent':
+            if in_rules:
+                agents = []
+                in_rules = False
+            agents.append(value.lower())
+        elif field == 'sitemap':
+            continue
+        else:
+            in_rules = True
+            if field == 'crawl-delay':
+                delay = _ROBOTS_DELAY_RE.fullmatch(value)
+                if delay:
+                    for agent in agents:
+                        delays.setdefault(agent, float(delay.group()))
+
+    return delays
+
+
+def _close_spool(future: Future):
+    """Done-callback closing the spool file of a prefetch that was never parsed."""
+    if not future.cancelled() and future.exception() is None and future.result() is not None:
+        future.result().close()
+
+
+def _record_tuple(loc: str, lastmod: Optional[int], changefreq: Optional[str],
+                  priority: Optional[float]) -> Tuple[str, Optional[int], Optional[str], Optional[float]]:
+    """Entry factory for parse_sitemap_batched: a bare tuple per URL."""
+    return loc, lastmod, changefreq, priority
+
+
 def filter_walmart_product_urls(url: str) -> bool:
     """
     Filter function for Walmart Canada product URLs.
@@ -339,25 +976,12 @@ def filter_walmart_product_urls(url: str) -> bool:
 
     Walmart product URLs follow pattern: /en/ip/[slug]/[item_id]
     """
-    # Must be a product page (item page)
-    if '/ip/' not in url and '/produit/' not in url:
-        return False
-
-    # Exclude disallowed patterns from robots.txt
-    disallowed_patterns = [
-        '/search',
-        '/recherche',
-        '/cart',
-        '/panier',
-        '/sign-in',
-        '/account',
-        '/kiosk/',
-        '+',  # Faceted navigation
-        '?f=',  # Filter params
-    ]
-
-    for pattern in disallowed_patterns:
-        if pattern in url:
-            return False
-
-    return True
+    if AHOCORASICK_AVAILABLE:
+        is_product = False
+        for _, accept in _WALMART_AUTOMATON.iter(url):
+            if not accept:
+                return False
+            is_product = True
+        return is_product
+
+    return _PRODUCT_SEARCH(url) is not None and _DISALLOWED_SEARCH(url) is None
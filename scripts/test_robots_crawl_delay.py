@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test that SitemapParser only honours robots.txt Crawl-delay groups
+that apply to it (its own User-agent or '*').
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scrapers.utils.sitemap_parser import SitemapParser
+
+
+ROBOTS_TXT = """\
+# Other crawlers are throttled hard
+User-agent: bingbot
+User-agent: yandex
+Crawl-delay: 30
+Disallow: /search
+
+Sitemap: https://www.walmart.ca/sitemap.xml
+
+User-agent: SmartSave
+Crawl-delay: 2
+
+User-agent: *
+Disallow: /checkout
+Crawl-delay: 5  # everyone else
+"""
+
+
+def test_wildcard_group():
+    """Test that a generic crawler gets the '*' delay"""
+    print("\n=== Testing '*' group ===")
+    parser = SitemapParser()
+    try:
+        assert parser.extract_crawl_delay(ROBOTS_TXT) == 5.0
+        print("[OK] Default user agent gets the '*' Crawl-delay")
+        assert parser.extract_crawl_delay(ROBOTS_TXT, user_agent='OtherBot/1.0') == 5.0
+        print("[OK] Unlisted user agent gets the '*' Crawl-delay")
+    finally:
+        parser.close()
+
+
+def test_own_group():
+    """Test that a crawler's own group beats '*'"""
+    print("\n=== Testing own User-agent group ===")
+    parser = SitemapParser(user_agent='SmartSave/1.1 (+https://example.com)')
+    try:
+        assert parser.extract_crawl_delay(ROBOTS_TXT) == 2.0
+        print("[OK] Own group Crawl-delay is used")
+        assert parser.extract_crawl_delay(ROBOTS_TXT, user_agent='bingbot/2.0') == 30.0
+        print("[OK] Shared group applies to every listed agent")
+    finally:
+        parser.close()
+
+
+def test_other_groups_ignored():
+    """Test that delays for other bots are ignored"""
+    print("\n=== Testing other bots' groups ===")
+    parser = SitemapParser()
+    try:
+        robots = "User-agent: bingbot\nCrawl-delay: 30\n\nUser-agent: *\nDisallow: /cart\n"
+        assert parser.extract_crawl_delay(robots) is None
+        print("[OK] No delay when only another bot's group sets one")
+        assert parser.extract_crawl_delay("Sitemap: https://www.walmart.ca/sitemap.xml\n") is None
+        print("[OK] No delay when robots.txt sets none")
+    finally:
+        parser.close()
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("robots.txt Crawl-delay Tests")
+    print("=" * 60)
+
+    try:
+        test_wildcard_group()
+        test_own_group()
+        test_other_groups_ignored()
+
+        print("\n" + "=" * 60)
+        print("[SUCCESS] All tests passed!")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n[FAIL] Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error during testing: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
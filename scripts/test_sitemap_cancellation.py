@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test that cancelling a Walmart sitemap crawl shuts down cleanly.
+The browser is stubbed out, so this runs without launching Playwright.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scrapers.base import ProductRecord
+from scrapers.common import get_iso_timestamp
+from scrapers.sites.walmart_canada import WalmartCanadaScraper
+from scrapers.utils.sitemap_parser import SitemapEntry
+
+
+class _EndlessSitemap:
+    """Sitemap parser stand-in that never runs out of product URLs."""
+
+    def iter_product_urls(self, sitemap_url, max_urls=None, url_filter=None,
+                          want_metadata=True):
+        n = 0
+        while True:
+            n += 1
+            yield SitemapEntry(f"https://www.walmart.ca/en/ip/product/{n}")
+
+
+class _StubbedScraper(WalmartCanadaScraper):
+    """Walmart scraper with the browser replaced by fake pages."""
+
+    def __init__(self, *args, products_before_hang: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sitemap_parser = _EndlessSitemap()
+        self.products_before_hang = products_before_hang
+        self.products_scraped = 0
+        self.browser_stopped = False
+
+    async def start_browser(self):
+        self.pages = [object() for _ in range(self.max_pages)]
+        self.page = self.pages[0]
+
+    async def stop_browser(self):
+        self.pages = []
+        self.page = None
+        self.browser_stopped = True
+
+    async def warmup_session(self):
+        pass
+
+    async def _sync_http_cookies(self):
+        pass
+
+    async def scrape_product_page(self, product_url, page):
+        # The first few products succeed, then every page hangs mid-scrape
+        if self.products_scraped >= self.products_before_hang:
+            await asyncio.Event().wait()
+
+        self.products_scraped += 1
+        product_id = product_url.rsplit('/', 1)[-1]
+        return ProductRecord(
+            store=self.store_name,
+            site_slug=self.site_slug,
+            source_url=product_url,
+            scrape_ts=get_iso_timestamp(),
+            external_id=product_id,
+            name=f"Test Product {product_id}",
+            brand=None,
+            size_text=None,
+            price=1.0,
+            currency='CAD',
+            unit_price=None,
+            unit_price_uom=None,
+            image_url=None,
+            category_path=None,
+            availability='in_stock',
+            query_category=None,
+            raw_source=None
+        )
+
+
+def _make_scraper(temp_root: Path) -> _StubbedScraper:
+    """Build a stubbed scraper whose data lives under temp_root."""
+    config = json.loads((project_root / 'configs' / 'walmart_canada.json').read_text())
+    # Keep everything buffered so only the shutdown flush can save it
+    config.setdefault('output', {}).update({'batch_size': 1000, 'checkpoint_interval': 1000})
+    config.setdefault('concurrency', {})['max_pages'] = 2
+
+    config_path = temp_root / 'walmart_canada.json'
+    config_path.write_text(json.dumps(config))
+    return _StubbedScraper(config_path, temp_root, fresh_start=True)
+
+
+def test_cancel_mid_crawl():
+    """Cancel while the queue is full and check records are flushed"""
+    print("\n=== Testing cancellation mid-crawl ===")
+
+    temp_root = Path(tempfile.mkdtemp())
+    try:
+        scraper = _make_scraper(temp_root)
+
+        async def run():
+            task = asyncio.create_task(
+                scraper._scrape_from_sitemap_async('https://www.walmart.ca/sitemap.xml')
+            )
+            # Let the producer fill the queue and the pages hang
+            while scraper.products_scraped < scraper.products_before_hang:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+
+            task.cancel()
+            try:
+                await asyncio.wait_for(task, timeout=5)
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(run())
+        print("[OK] Cancelled crawl finished")
+
+        assert scraper.browser_stopped, "Browser should be stopped after cancel"
+        print("[OK] Browser stopped")
+
+        lines = scraper.jsonl_path.read_text().splitlines()
+        assert len(lines) == scraper.products_before_hang, \
+            f"Expected {scraper.products_before_hang} saved records, got {len(lines)}"
+        print(f"[OK] {len(lines)} buffered records were flushed")
+
+        checkpoint = json.loads(scraper.checkpoint_path.read_text())
+        assert checkpoint.get('last_url', '').endswith(f"/{scraper.products_before_hang}"), \
+            f"Checkpoint should point at the last saved product, got {checkpoint.get('last_url')}"
+        print("[OK] Checkpoint records the last saved product")
+    finally:
+        shutil.rmtree(temp_root, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Sitemap Cancellation Tests")
+    print("=" * 60)
+
+    try:
+        test_cancel_mid_crawl()
+
+        print("\n" + "=" * 60)
+        print("[SUCCESS] All tests passed!")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n[FAIL] Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n[ERROR] Error during testing: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()